@@ -0,0 +1,176 @@
+"""
+Statistical Greek-English alignment candidates, computed offline over the whole NT.
+
+For each translation, every Greek lemma and English word type is scored with the Dice
+coefficient over verses, 2 * c(lemma, word) / (c(lemma) + c(word)), where c counts the
+verses containing them. Each Greek token is then linked to the English token in its
+verse with the highest score. Build with `python nt_tools.py build-alignment`.
+"""
+
+import os
+import re
+import threading
+
+import numpy as np
+
+from corpus import load_corpus
+from data_structures import CACHE_DIR, load_english_verses
+
+ALIGNMENT_FILE = os.path.join(CACHE_DIR, "alignment.npz")
+ALIGNMENT_TRANSLATIONS = ("ESV", "KJV")
+ENGLISH_TOKEN_PATTERN = re.compile(r"\w+(?:'\w+)*")
+# Number of best English words kept per lemma
+GLOSSES_PER_LEMMA = 3
+# Lemma/word pairs seen together in fewer verses than this are not kept as glosses
+MIN_GLOSS_VERSES = 2
+
+
+def english_tokens(text):
+    """Lower-cased English word tokens of a verse, in order."""
+    return [token.lower() for token in ENGLISH_TOKEN_PATTERN.findall(text)]
+
+
+def english_token_spans(text):
+    """(start, end) character spans of the tokens returned by english_tokens."""
+    return [match.span() for match in ENGLISH_TOKEN_PATTERN.finditer(text)]
+
+
+def verse_bounds(corpus):
+    """Start offsets of every verse in the corpus, plus the end of the last one."""
+    starts = np.flatnonzero(np.r_[True, corpus.ordinal[1:] != corpus.ordinal[:-1]])
+    return np.r_[starts, len(corpus)]
+
+
+def align_translation(corpus, translation):
+    """
+    Compute the alignment arrays for one translation:
+    best (int16, per Greek token: index of the English token in its verse, or -1),
+    score (uint8, per Greek token: Dice * 255), glosses (int32, lemmas x GLOSSES_PER_LEMMA
+    English word IDs, -1 padded), gloss_scores (uint8, same shape) and vocab (list of words).
+    """
+    verses, _ = load_english_verses(translation)
+    bounds = verse_bounds(corpus)
+    vocab_index = {}
+    verse_tokens = []
+    lemma_sets, word_sets = [], []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        reference = (int(corpus.book[start]), int(corpus.chapter[start]), int(corpus.verse[start]))
+        tokens = np.array([vocab_index.setdefault(token, len(vocab_index))
+                           for token in english_tokens(verses.get(reference, ""))], dtype=np.int64)
+        verse_tokens.append(tokens)
+        lemma_sets.append(np.unique(corpus.lemma_id[start:end]).astype(np.int64))
+        word_sets.append(np.unique(tokens))
+
+    n_words = max(len(vocab_index), 1)
+    lemma_verses = np.bincount(np.concatenate(lemma_sets), minlength=len(corpus.lemmas))
+    word_verses = np.bincount(np.concatenate(word_sets), minlength=n_words)
+    # Every (lemma, word) pair of each verse encoded as lemma * n_words + word, then counted
+    pairs = np.concatenate([np.add.outer(lemmas * n_words, words).ravel()
+                            for lemmas, words in zip(lemma_sets, word_sets)])
+    pair_keys, pair_verses = np.unique(pairs, return_counts=True)
+    pair_lemmas, pair_words = pair_keys // n_words, pair_keys % n_words
+    pair_dice = 2.0 * pair_verses / (lemma_verses[pair_lemmas] + word_verses[pair_words])
+
+    best = np.full(len(corpus), -1, dtype=np.int16)
+    score = np.zeros(len(corpus), dtype=np.uint8)
+    for start, end, tokens in zip(bounds[:-1], bounds[1:], verse_tokens):
+        if not len(tokens):
+            continue
+        keys = np.add.outer(corpus.lemma_id[start:end].astype(np.int64) * n_words, tokens)
+        dice = pair_dice[np.searchsorted(pair_keys, keys)]
+        best[start:end] = dice.argmax(axis=1)
+        score[start:end] = np.round(dice.max(axis=1) * 255)
+
+    glosses = np.full((len(corpus.lemmas), GLOSSES_PER_LEMMA), -1, dtype=np.int32)
+    gloss_scores = np.zeros(glosses.shape, dtype=np.uint8)
+    kept = pair_verses >= MIN_GLOSS_VERSES
+    lemmas, words, dice = pair_lemmas[kept], pair_words[kept], pair_dice[kept]
+    order = np.lexsort((-dice, lemmas))
+    lemmas, words, dice = lemmas[order], words[order], dice[order]
+    # Rank of each pair within its lemma; only the first GLOSSES_PER_LEMMA are kept
+    firsts = np.r_[0, np.flatnonzero(lemmas[1:] != lemmas[:-1]) + 1]
+    ranks = np.arange(len(lemmas)) - np.repeat(firsts, np.diff(np.r_[firsts, len(lemmas)]))
+    top = ranks < GLOSSES_PER_LEMMA
+    glosses[lemmas[top], ranks[top]] = words[top]
+    gloss_scores[lemmas[top], ranks[top]] = np.round(dice[top] * 255)
+    return best, score, glosses, gloss_scores, list(vocab_index)
+
+
+def build_alignment(path=ALIGNMENT_FILE, translations=ALIGNMENT_TRANSLATIONS):
+    """Align every translation and save the arrays to one .npz file (no pickled objects)."""
+    corpus = load_corpus()
+    arrays = {'tokens': np.array(len(corpus)), 'lemmas': np.array(len(corpus.lemmas))}
+    for translation in translations:
+        best, score, glosses, gloss_scores, vocab = align_translation(corpus, translation)
+        arrays[f"{translation}_best"] = best
+        arrays[f"{translation}_score"] = score
+        arrays[f"{translation}_glosses"] = glosses
+        arrays[f"{translation}_gloss_scores"] = gloss_scores
+        arrays[f"{translation}_vocab"] = np.frombuffer("\n".join(vocab).encode('utf-8'), dtype=np.uint8)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp.npz"
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+    return arrays
+
+
+class Alignment:
+    """Lookups into a saved alignment file for the corpus it was built from."""
+
+    def __init__(self, arrays, corpus):
+        if int(arrays['tokens']) != len(corpus) or int(arrays['lemmas']) != len(corpus.lemmas):
+            raise ValueError("The alignment file was built from a different corpus; rebuild it")
+        self.corpus = corpus
+        self.best, self.score, self.glosses, self.gloss_scores, self.vocab = {}, {}, {}, {}, {}
+        self.translations = []
+        for name in arrays:
+            if name.endswith("_best"):
+                translation = name[:-len("_best")]
+                self.translations.append(translation)
+                self.best[translation] = arrays[name]
+                self.score[translation] = arrays[f"{translation}_score"]
+                self.glosses[translation] = arrays[f"{translation}_glosses"]
+                self.gloss_scores[translation] = arrays[f"{translation}_gloss_scores"]
+                self.vocab[translation] = bytes(arrays[f"{translation}_vocab"]).decode('utf-8').split("\n")
+
+    def token_position(self, book, chapter, verse, index):
+        """Corpus position of the index-th word of a verse, or None."""
+        verse_slice = self.corpus.verse_slice(book, chapter, verse)
+        position = verse_slice.start + index
+        return position if position < verse_slice.stop else None
+
+    def gloss_span(self, translation, position, text, min_score=0.1):
+        """(start, end) span in the verse text of the English word aligned to a Greek token, or None."""
+        if translation not in self.best or position is None:
+            return None
+        index = int(self.best[translation][position])
+        if index < 0 or self.score[translation][position] < min_score * 255:
+            return None
+        spans = english_token_spans(text)
+        return spans[index] if index < len(spans) else None
+
+    def lemma_glosses(self, translation, lemma):
+        """The lemma's most strongly associated English words as (word, Dice score) pairs."""
+        lemma_id = self.corpus.lemma_index.get(lemma)
+        if translation not in self.glosses or lemma_id is None:
+            return []
+        return [(self.vocab[translation][word], float(score) / 255)
+                for word, score in zip(self.glosses[translation][lemma_id], self.gloss_scores[translation][lemma_id])
+                if word >= 0]
+
+
+_alignment = None
+_alignment_lock = threading.Lock()
+
+
+def load_alignment():
+    """Return the shared Alignment, or None if the file has not been built or is out of date."""
+    global _alignment
+    with _alignment_lock:
+        if _alignment is None and os.path.exists(ALIGNMENT_FILE):
+            try:
+                with np.load(ALIGNMENT_FILE, allow_pickle=False) as data:
+                    _alignment = Alignment({name: data[name] for name in data.files}, load_corpus())
+            except (OSError, ValueError):
+                _alignment = None
+        return _alignment
@@ -0,0 +1,129 @@
+"""
+Small timing benchmarks for the data loading paths.
+
+Usage:
+    python benchmarks.py strongs-cache
+    python benchmarks.py strongs-memory
+    python benchmarks.py strongs-entry-size
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+from data_structures import load_strongs_greek, parse_strongs_entry, parse_strongs_greek
+
+STRONGS_XML = "strongsgreek.xml"
+
+
+def timed(func, *args, repeat=1):
+    """Run func(*args) repeat times and return (best seconds, last result)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_strongs_cache(repeat):
+    """Compare parsing strongsgreek.xml with a cold and a warm binary cache."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_file = os.path.join(tmp_dir, "strongsgreek.pickle")
+        parse_time, entries = timed(parse_strongs_greek, STRONGS_XML, repeat=repeat)
+        cold_time, _ = timed(load_strongs_greek, STRONGS_XML, cache_file)
+        warm_time, cached = timed(load_strongs_greek, STRONGS_XML, cache_file, repeat=repeat)
+        assert cached.by_unicode == entries
+        print(f"entries:             {len(entries)}")
+        print(f"parse XML:           {parse_time * 1000:8.1f} ms")
+        print(f"cold (parse+write):  {cold_time * 1000:8.1f} ms")
+        print(f"warm (cache hit):    {warm_time * 1000:8.1f} ms")
+
+
+def parse_strongs_greek_dom(xml_file):
+    """The previous whole-document loader, kept as the baseline for parse_strongs_greek."""
+    unicode_to_entry = {}
+    for entry in ET.parse(xml_file).getroot().findall("entries/entry"):
+        parsed = parse_strongs_entry(entry)
+        if parsed:
+            unicode_to_entry[parsed[0]] = parsed[1]
+    return unicode_to_entry
+
+
+def _measure_in_child(loader_name, results):
+    import resource
+    loaders = {"none": lambda path: {}, "dom": parse_strongs_greek_dom, "iterparse": parse_strongs_greek}
+    start = time.perf_counter()
+    entries = loaders[loader_name](STRONGS_XML)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    scale = 1 if os.uname().sysname == "Darwin" else 1024
+    results.put((len(entries), elapsed, peak * scale))
+
+
+def bench_strongs_memory(repeat):
+    """Peak RSS and wall time of the DOM and iterparse loaders, each in a fresh process."""
+    context = multiprocessing.get_context("spawn")
+    measurements = {}
+    for loader_name in ("none", "dom", "iterparse"):
+        runs = []
+        for _ in range(repeat):
+            results = context.Queue()
+            process = context.Process(target=_measure_in_child, args=(loader_name, results))
+            process.start()
+            runs.append(results.get())
+            process.join()
+        measurements[loader_name] = (runs[0][0], min(r[1] for r in runs), min(r[2] for r in runs))
+    baseline = measurements["none"][2]
+    print(f"interpreter baseline RSS: {baseline / 2**20:8.1f} MiB")
+    for loader_name in ("dom", "iterparse"):
+        count, elapsed, peak = measurements[loader_name]
+        print(f"{loader_name:>10}: {count} entries, {elapsed * 1000:7.1f} ms, "
+              f"peak RSS {peak / 2**20:6.1f} MiB (+{(peak - baseline) / 2**20:.1f} MiB)")
+
+
+def _container_bytes(value):
+    """Size of a record's own containers, excluding the strings and ints they share with other layouts."""
+    size = sys.getsizeof(value)
+    fields = value.values() if isinstance(value, dict) else (getattr(value, name) for name in value.__slots__)
+    # The empty tuple is a shared singleton, so only non-empty reference tuples count
+    return size + sum(sys.getsizeof(field) for field in fields if isinstance(field, tuple) and field)
+
+
+def bench_strongs_entry_size(repeat):
+    """Memory per lexicon entry for the StrongsEntry records versus dict-per-entry layouts."""
+    entries = list(parse_strongs_greek(STRONGS_XML).values())
+    layouts = {
+        "dict, 3 keys (old)": [
+            {'definition': e.definition, 'pronunciation': e.pronunciation, 'transliteration': e.transliteration}
+            for e in entries
+        ],
+        "dict, all fields": [{name: getattr(e, name) for name in e.__slots__} for e in entries],
+        "StrongsEntry": entries,
+    }
+    print(f"entries: {len(entries)}")
+    for name, records in layouts.items():
+        per_entry = sum(_container_bytes(record) for record in records) / len(records)
+        print(f"{name:>20}: {per_entry:6.1f} bytes/entry of container overhead")
+
+
+BENCHMARKS = {
+    "strongs-cache": bench_strongs_cache,
+    "strongs-memory": bench_strongs_memory,
+    "strongs-entry-size": bench_strongs_entry_size,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args.repeat)
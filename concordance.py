@@ -0,0 +1,55 @@
+import numpy as np
+
+from corpus import load_corpus
+
+
+class LemmaConcordance:
+    """
+    Inverted index from lemma ID to the sorted positions of its tokens in a ColumnarCorpus.
+    Positions are stored once for all lemmas (CSR layout): the tokens of lemma i are
+    positions[offsets[i]:offsets[i + 1]], in canonical order.
+    """
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+        # A stable sort keeps each lemma's positions in token order
+        self.positions = np.argsort(corpus.lemma_id, kind='stable').astype(np.int32)
+        counts = np.bincount(corpus.lemma_id, minlength=len(corpus.lemmas))
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    def occurrences(self, lemma):
+        """All token positions of a lemma as a read-only view (empty if unknown)."""
+        lemma_id = self.corpus.lemma_index.get(lemma)
+        if lemma_id is None:
+            return self.positions[:0]
+        return self.positions[self.offsets[lemma_id]:self.offsets[lemma_id + 1]]
+
+    def count(self, lemma):
+        return len(self.occurrences(lemma))
+
+    def page(self, lemma, page=0, page_size=50):
+        """
+        One page of occurrences as dicts with the token position, its (book, chapter, verse)
+        reference, the inflected word and the verse text with the word marked.
+        Only the rows of the requested page are materialised.
+        """
+        corpus = self.corpus
+        results = []
+        for position in self.occurrences(lemma)[page * page_size:(page + 1) * page_size]:
+            position = int(position)
+            reference = corpus.reference(position)
+            verse = corpus.verse_slice(*reference)
+            words = [corpus.text(i) for i in range(verse.start, verse.stop)]
+            words[position - verse.start] = f"<b>{words[position - verse.start]}</b>"
+            results.append({
+                'position': position,
+                'reference': reference,
+                'word': corpus.word(position),
+                'context': " ".join(words),
+            })
+        return results
+
+
+def load_concordance():
+    """Build the concordance over the shared corpus."""
+    return LemmaConcordance(load_corpus())
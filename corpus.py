@@ -0,0 +1,400 @@
+"""
+Whole-New-Testament data built once from MorphGNT and cached under cache/.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+
+import numpy as np
+from pysblgnt import morphgnt_rows
+
+from data_structures import (
+    CACHE_DIR, CCAT_PARSE_FIELDS, NEW_TESTAMENT, NUMBER_TO_DATA, file_sha256, get_book_number, load_cached, load_greek_book,
+    load_strongs_greek, load_versification, seed_versification, verse_ordinal
+)
+
+STRONGS_XML = "strongsgreek.xml"
+LEMMA_JOIN_FILE = os.path.join(CACHE_DIR, "lemma_join.pickle")
+LEMMA_JOIN_VERSION = 1
+CORPUS_FILE = os.path.join(CACHE_DIR, "ntcorpus.bin")
+CORPUS_MAGIC = b"GNTCORP\0"
+CORPUS_VERSION = 2
+
+
+class LemmaJoin:
+    """
+    Every MorphGNT lemma resolved against the Strong's lexicon.
+    lemma_ids maps each distinct lemma to its Strong's number (0 if unresolved) and
+    token_ids holds, per book, one Strong's number per word token in the same order
+    as load_greek_book, so a verse's (start, end) slice indexes both.
+    """
+
+    def __init__(self, lemma_ids, token_ids, lemma_counts):
+        self.lemma_ids = lemma_ids
+        self.token_ids = token_ids
+        self.lemma_counts = lemma_counts
+
+    def entry_id(self, lemma):
+        """Strong's number for a MorphGNT lemma, or 0 if it did not resolve."""
+        return self.lemma_ids.get(lemma, 0)
+
+    def verse_entry_ids(self, book, chapter, verse):
+        """Strong's numbers of the words of a verse, aligned with get_greek_text."""
+        book_num = get_book_number(book)
+        if book_num not in self.token_ids:
+            return []
+        _, verse_slices = load_greek_book(book_num)
+        start, end = verse_slices.get((chapter, verse), (0, 0))
+        return self.token_ids[book_num][start:end].tolist()
+
+    def unresolved(self):
+        """Unresolved lemmas as (lemma, token count) pairs, most frequent first."""
+        lemmas = [lemma for lemma, strongs in self.lemma_ids.items() if strongs == 0]
+        return sorted(((lemma, self.lemma_counts[lemma]) for lemma in lemmas), key=lambda item: (-item[1], item[0]))
+
+
+def build_lemma_join(xml_file=STRONGS_XML, progress=None, lexicon=None):
+    """
+    Resolve each distinct lemma once and record the result for every token of the NT.
+    lexicon may be an already loaded (or loading) StrongsLexicon or LazyLexicon for xml_file;
+    otherwise it is loaded here.
+    """
+    if lexicon is None:
+        lexicon = load_strongs_greek(xml_file)
+    lemma_ids = {}
+    lemma_counts = {}
+    token_ids = {}
+    for i, (book_num, *_) in enumerate(NEW_TESTAMENT):
+        ids = array('H')
+        for row in morphgnt_rows(book_num):
+            lemma = row['lemma']
+            if lemma not in lemma_ids:
+                entry, _ = lexicon.lookup(lemma)
+                lemma_ids[lemma] = entry.strongs if entry else 0
+            lemma_counts[lemma] = lemma_counts.get(lemma, 0) + 1
+            ids.append(lemma_ids[lemma])
+        token_ids[book_num] = ids
+        if progress:
+            progress((i + 1) / len(NEW_TESTAMENT))
+    return LemmaJoin(lemma_ids, token_ids, lemma_counts)
+
+
+def load_lemma_join(xml_file=STRONGS_XML, cache_file=LEMMA_JOIN_FILE, progress=None, lexicon=None):
+    """
+    Return the LemmaJoin, rebuilding it only when the lexicon XML changes.
+    Pass the lexicon the caller is already loading so a rebuild does not parse the XML again.
+    """
+    build = lambda path: build_lemma_join(path, progress, lexicon)
+    return load_cached(xml_file, cache_file, LEMMA_JOIN_VERSION, build)
+
+
+# Names of the CCAT parse code positions, usable as ColumnarCorpus.mask() keywords
+MORPH_FIELDS = tuple(label.lower() for label, _ in CCAT_PARSE_FIELDS)
+
+
+class ColumnarCorpus:
+    """
+    Every NT word token held as NumPy columns, in canonical order.
+    book, chapter, verse and ordinal (see verse_ordinal) locate each token;
+    lemma_id, pos_id and parse_id index the lemmas, pos_codes and parse_codes lists;
+    morph holds the 8 parse code characters per token as uint8 for masking.
+    Surface forms (the 'text' with punctuation and the bare 'word') are stored as
+    UTF-8 byte buffers with one offset per token boundary.
+    lemma_strongs, when available, gives the Strong's number of each lemma ID (0 if unresolved);
+    it is None when the corpus was built from MorphGNT or the lexicon has changed since the file was written.
+    """
+
+    def __init__(self, columns, lemmas, pos_codes, parse_codes, text_buffer, word_buffer, lemma_strongs=None):
+        self.book = columns['book']
+        self.chapter = columns['chapter']
+        self.verse = columns['verse']
+        self.ordinal = columns['ordinal']
+        self.lemma_id = columns['lemma_id']
+        self.pos_id = columns['pos_id']
+        self.parse_id = columns['parse_id']
+        self.morph = columns['morph']
+        self.text_offsets = columns['text_offsets']
+        self.word_offsets = columns['word_offsets']
+        self.lemmas = lemmas
+        self.pos_codes = pos_codes
+        self.parse_codes = parse_codes
+        self.text_buffer = text_buffer
+        self.word_buffer = word_buffer
+        self.lemma_strongs = lemma_strongs
+        self.lemma_index = {lemma: i for i, lemma in enumerate(lemmas)}
+
+    @classmethod
+    def from_morphgnt(cls):
+        """Read every book from MorphGNT once and build the columns."""
+        lemma_index, pos_index, parse_index = {}, {}, {}
+        columns = {name: array('l') for name in ('book', 'chapter', 'verse', 'ordinal', 'lemma_id', 'pos_id', 'parse_id')}
+        morph = bytearray()
+        texts, words = [], []
+        text_offsets, word_offsets = array('q', [0]), array('q', [0])
+        for book_num, *_ in NEW_TESTAMENT:
+            for row in morphgnt_rows(book_num):
+                chapter, verse = int(row['bcv'][2:4]), int(row['bcv'][4:])
+                columns['book'].append(book_num)
+                columns['chapter'].append(chapter)
+                columns['verse'].append(verse)
+                columns['ordinal'].append(verse_ordinal(book_num, chapter, verse))
+                columns['lemma_id'].append(lemma_index.setdefault(row['lemma'], len(lemma_index)))
+                columns['pos_id'].append(pos_index.setdefault(row['ccat-pos'], len(pos_index)))
+                columns['parse_id'].append(parse_index.setdefault(row['ccat-parse'], len(parse_index)))
+                morph += row['ccat-parse'].ljust(8, '-')[:8].encode('ascii')
+                text, word = row['text'].encode('utf-8'), row['word'].encode('utf-8')
+                texts.append(text)
+                words.append(word)
+                text_offsets.append(text_offsets[-1] + len(text))
+                word_offsets.append(word_offsets[-1] + len(word))
+        arrays = {
+            'book': np.array(columns['book'], dtype=np.uint8),
+            'chapter': np.array(columns['chapter'], dtype=np.uint8),
+            'verse': np.array(columns['verse'], dtype=np.uint8),
+            'ordinal': np.array(columns['ordinal'], dtype=np.int32),
+            'lemma_id': np.array(columns['lemma_id'], dtype=np.int32),
+            'pos_id': np.array(columns['pos_id'], dtype=np.uint8),
+            'parse_id': np.array(columns['parse_id'], dtype=np.uint16),
+            'morph': np.frombuffer(bytes(morph), dtype=np.uint8).reshape(-1, 8),
+            'text_offsets': np.array(text_offsets, dtype=np.int64),
+            'word_offsets': np.array(word_offsets, dtype=np.int64),
+        }
+        return cls(arrays, list(lemma_index), list(pos_index), list(parse_index), b''.join(texts), b''.join(words))
+
+    def __len__(self):
+        return len(self.book)
+
+    def text(self, i):
+        return bytes(self.text_buffer[self.text_offsets[i]:self.text_offsets[i + 1]]).decode('utf-8')
+
+    def word(self, i):
+        return bytes(self.word_buffer[self.word_offsets[i]:self.word_offsets[i + 1]]).decode('utf-8')
+
+    def lemma(self, i):
+        return self.lemmas[self.lemma_id[i]]
+
+    def reference(self, i):
+        """(book_name, chapter, verse) of a token."""
+        return NUMBER_TO_DATA[int(self.book[i])][0], int(self.chapter[i]), int(self.verse[i])
+
+    def verse_range(self, start_ref, end_ref):
+        """
+        Token slice covering (book, chapter, verse) start_ref to end_ref inclusive.
+        Tokens are in canonical order, so this is two binary searches on the ordinal column.
+        """
+        start = np.searchsorted(self.ordinal, verse_ordinal(*start_ref), side='left')
+        end = np.searchsorted(self.ordinal, verse_ordinal(*end_ref), side='right')
+        return slice(int(start), int(end))
+
+    def verse_slice(self, book, chapter, verse):
+        return self.verse_range((book, chapter, verse), (book, chapter, verse))
+
+    def mask(self, pos=None, lemma=None, books=None, **morph):
+        """
+        Boolean mask of the tokens matching every given criterion.
+        pos and lemma take one code/lemma or a list; books takes book identifiers.
+        Morphology keywords are MORPH_FIELDS names with a string of accepted CCAT
+        code characters, e.g. mask(pos='V-', tense='A', voice='P', mood='P').
+        """
+        result = np.ones(len(self), dtype=bool)
+        if pos is not None:
+            codes = [pos] if isinstance(pos, str) else pos
+            result &= np.isin(self.pos_id, [self.pos_codes.index(c) for c in codes if c in self.pos_codes])
+        if lemma is not None:
+            lemmas = [lemma] if isinstance(lemma, str) else lemma
+            result &= np.isin(self.lemma_id, [self.lemma_index[l] for l in lemmas if l in self.lemma_index])
+        if books is not None:
+            result &= np.isin(self.book, [get_book_number(b) for b in books])
+        for field, codes in morph.items():
+            if field not in MORPH_FIELDS:
+                raise ValueError(f"Unknown morphology field: {field}")
+            column = self.morph[:, MORPH_FIELDS.index(field)]
+            result &= np.isin(column, np.frombuffer(codes.encode('ascii'), dtype=np.uint8))
+        return result
+
+    def verse_entry_ids(self, book, chapter, verse):
+        """Strong's numbers of the words of a verse, aligned with get_greek_text (needs lemma_strongs)."""
+        if verse_ordinal(book, chapter, verse) is None:
+            return []
+        return self.lemma_strongs[self.lemma_id[self.verse_slice(book, chapter, verse)]].tolist()
+
+    def book_index(self, book_num):
+        """A book as (words, verse_slices), the same index build_greek_book_index makes from MorphGNT."""
+        book_start = int(np.searchsorted(self.book, book_num, side='left'))
+        book_end = int(np.searchsorted(self.book, book_num, side='right'))
+        words = self.tokens(slice(book_start, book_end))
+        ordinals = self.ordinal[book_start:book_end]
+        starts = np.flatnonzero(np.r_[True, ordinals[1:] != ordinals[:-1]]) if len(ordinals) else []
+        verse_slices = {}
+        for start, end in zip(starts, np.r_[starts[1:], len(ordinals)] if len(ordinals) else []):
+            i = book_start + int(start)
+            verse_slices[(int(self.chapter[i]), int(self.verse[i]))] = (int(start), int(end))
+        return words, verse_slices
+
+    def tokens(self, indices):
+        """Word records, in the get_greek_text format, for token indices or a slice."""
+        if isinstance(indices, slice):
+            indices = range(*indices.indices(len(self)))
+        return [{
+            'text': self.text(i),
+            'word': self.word(i),
+            'lemma': self.lemma(i),
+            'pos': self.pos_codes[self.pos_id[i]],
+            'parse': self.parse_codes[self.parse_id[i]],
+        } for i in indices]
+
+
+# Array columns of the corpus file, in the order they are written
+CORPUS_COLUMNS = (
+    'book', 'chapter', 'verse', 'ordinal', 'lemma_id', 'pos_id', 'parse_id', 'morph',
+    'text_offsets', 'word_offsets', 'text_buffer', 'word_buffer', 'lemma_strongs',
+)
+
+
+def lexicon_signature(xml_file=STRONGS_XML):
+    """The lexicon XML's mtime, size and SHA-256, as load_cached records its source."""
+    stat = os.stat(xml_file)
+    return {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'sha256': file_sha256(xml_file)}
+
+
+def lexicon_is_current(signature, xml_file=STRONGS_XML):
+    """True if xml_file still matches a lexicon_signature(), by mtime and size or failing that by digest."""
+    try:
+        stat = os.stat(xml_file)
+    except FileNotFoundError:
+        return False
+    if signature['mtime'] == stat.st_mtime_ns and signature['size'] == stat.st_size:
+        return True
+    return signature['sha256'] == file_sha256(xml_file)
+
+
+def write_corpus_file(corpus, lemma_join, path=CORPUS_FILE, xml_file=STRONGS_XML):
+    """
+    Write a corpus, the versification table and each lemma's Strong's number to one file.
+    Layout: magic, format version and header length, a JSON header (string tables,
+    versification, the signature of the lexicon XML lemma_join was built from and the
+    dtype, shape and offset of each column), then the columns as raw little-endian
+    arrays aligned to 64 bytes so they can be mapped directly.
+    """
+    arrays = {name: getattr(corpus, name) for name in CORPUS_COLUMNS[:10]}
+    arrays['text_buffer'] = np.frombuffer(corpus.text_buffer, dtype=np.uint8)
+    arrays['word_buffer'] = np.frombuffer(corpus.word_buffer, dtype=np.uint8)
+    arrays['lemma_strongs'] = np.array([lemma_join.entry_id(lemma) for lemma in corpus.lemmas], dtype=np.uint16)
+    header = {
+        'lemmas': corpus.lemmas,
+        'pos_codes': corpus.pos_codes,
+        'parse_codes': corpus.parse_codes,
+        'versification': load_versification(),
+        'lexicon': lexicon_signature(xml_file),
+        'columns': {},
+    }
+    # Offsets are relative to the start of the data section, which follows the header
+    offset = 0
+    for name in CORPUS_COLUMNS:
+        data = np.ascontiguousarray(arrays[name])
+        data = data.astype(data.dtype.newbyteorder('<'), copy=False)
+        arrays[name] = data
+        header['columns'][name] = {'dtype': data.dtype.str, 'shape': list(data.shape), 'offset': offset}
+        offset += -(-data.nbytes // 64) * 64
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    prefix_size = len(CORPUS_MAGIC) + 8
+    data_start = -(-(prefix_size + len(header_bytes)) // 64) * 64
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(CORPUS_MAGIC)
+        file.write(struct.pack('<II', CORPUS_VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        for name in CORPUS_COLUMNS:
+            column = header['columns'][name]
+            file.seek(data_start + column['offset'])
+            file.write(arrays[name].tobytes())
+    os.replace(tmp_path, path)
+
+
+def open_corpus_file(path=CORPUS_FILE, xml_file=STRONGS_XML):
+    """
+    Map a corpus file read-only and return a ColumnarCorpus whose columns are views
+    into the mapping, so processes opening the same file share its pages.
+    The Strong's numbers are left out (lemma_strongs is None) if xml_file has changed
+    since the file was written. Raises ValueError if the file is not a corpus file of the current version.
+    """
+    with open(path, "rb") as file:
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    prefix_size = len(CORPUS_MAGIC) + 8
+    if mapping[:len(CORPUS_MAGIC)] != CORPUS_MAGIC:
+        raise ValueError(f"{path} is not a corpus file")
+    version, header_size = struct.unpack('<II', mapping[len(CORPUS_MAGIC):prefix_size])
+    if version != CORPUS_VERSION:
+        raise ValueError(f"{path} has corpus format version {version}, expected {CORPUS_VERSION}")
+    header = json.loads(mapping[prefix_size:prefix_size + header_size].decode('utf-8'))
+    # Ordinal lookups on the mapped corpus then need no MorphGNT pass or versification.json
+    seed_versification(header['versification'])
+    data_start = -(-(prefix_size + header_size) // 64) * 64
+    arrays = {}
+    for name, column in header['columns'].items():
+        dtype = np.dtype(column['dtype'])
+        count = int(np.prod(column['shape'])) if column['shape'] else 1
+        arrays[name] = np.frombuffer(mapping, dtype=dtype, count=count,
+                                     offset=data_start + column['offset']).reshape(column['shape'])
+    lemma_strongs = arrays['lemma_strongs'] if lexicon_is_current(header['lexicon'], xml_file) else None
+    return ColumnarCorpus(
+        arrays, header['lemmas'], header['pos_codes'], header['parse_codes'],
+        memoryview(arrays['text_buffer']), memoryview(arrays['word_buffer']), lemma_strongs,
+    )
+
+
+def build_corpus_file(path=CORPUS_FILE, xml_file=STRONGS_XML):
+    """Build the corpus from MorphGNT, join it with the lexicon and write it to path."""
+    corpus = ColumnarCorpus.from_morphgnt()
+    write_corpus_file(corpus, load_lemma_join(xml_file), path, xml_file)
+    return corpus
+
+
+_corpus = None
+_corpus_file_checked = False
+# Guards _corpus and the one-time check for the corpus file; never held during a build
+_corpus_lock = threading.Lock()
+# Serialises MorphGNT builds so concurrent load_corpus() calls build only once
+_corpus_build_lock = threading.Lock()
+
+
+def load_corpus_file():
+    """
+    Return the process-wide ColumnarCorpus if it is available without reading MorphGNT:
+    mapped from the prebuilt corpus file (see nt_tools.py build-corpus) or already built.
+    Returns None otherwise, without waiting for a build in progress.
+    """
+    global _corpus, _corpus_file_checked
+    with _corpus_lock:
+        if _corpus is None and not _corpus_file_checked:
+            _corpus_file_checked = True
+            if os.path.exists(CORPUS_FILE):
+                try:
+                    _corpus = open_corpus_file(CORPUS_FILE)
+                except (OSError, ValueError):
+                    _corpus = None
+        return _corpus
+
+
+def load_corpus():
+    """
+    Return the process-wide ColumnarCorpus: mapped from the prebuilt corpus file when
+    one of the current version exists, otherwise built from MorphGNT.
+    The build runs outside _corpus_lock and is published when complete.
+    """
+    global _corpus
+    corpus = load_corpus_file()
+    if corpus is not None:
+        return corpus
+    with _corpus_build_lock:
+        corpus = load_corpus_file()
+        if corpus is None:
+            corpus = ColumnarCorpus.from_morphgnt()
+            with _corpus_lock:
+                _corpus = corpus
+        return corpus
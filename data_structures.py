@@ -1,10 +1,20 @@
 from pysblgnt import morphgnt_rows
 import xml.etree.ElementTree as ET
+import bisect
+import functools
+import hashlib
 import json
 import os
+import pickle
+import sqlite3
+import tempfile
+import threading
 import unicodedata
 
 
+# Directory for derived data that can always be rebuilt from the sources
+CACHE_DIR = "cache"
+
 # Canonical list of New Testament books in order
 NEW_TESTAMENT = [
     (1, "Matthew",    "Mt", "The Gospel According to Matthew", "Matt"),
@@ -54,53 +64,455 @@ def get_book_data(identifier):
         return KJV_ABBREV_TO_DATA[identifier]
     return None
 
+def get_book_number(identifier):
+    """Get the canonical book number for any identifier accepted by get_book_data, or None."""
+    if isinstance(identifier, int):
+        return identifier if identifier in NUMBER_TO_DATA else None
+    book_data = get_book_data(identifier)
+    return book_data[0] if book_data else None
+
 
-def get_full_text_with_asterisk(element):
-    """Recursively get all text from an element, replacing subelements with an asterisk."""
+def get_inline_text(element):
+    """
+    Recursively get all text from a Strong's element, rendering nested elements inline:
+    <greek> as its Unicode form, <strongsref> as G123/H123, <pronunciation> as its
+    pronunciation and <latin> as its text.
+    """
     parts = []
     if element.text:
         parts.append(element.text)
     for child in element:
-        parts.append("*")  # Insert asterisk for subelement
+        if child.tag == "greek":
+            parts.append(child.get("unicode") or "")
+        elif child.tag == "strongsref":
+            prefix = "H" if child.get("language") == "HEBREW" else "G"
+            parts.append(f"{prefix}{int(child.get('strongs'))}")
+        elif child.tag == "pronunciation":
+            parts.append(child.get("strongs") or "")
+        else:
+            parts.append(get_inline_text(child))
         if child.tail:
             parts.append(child.tail)
     return ''.join(parts).strip()
 
-def parse_strongs_greek(xml_file):
-    """Parse the strongsgreek.xml file and build a lookup dictionary with multiple fields per entry."""
-    tree = ET.parse(xml_file)
-    root = tree.getroot()
-
-    # Create a dictionary for lookups
-    unicode_to_entry = {}
-
-    # Iterate over all <entry> elements
-    for entry in root.findall("entries/entry"):
-        # Get the unicode value from the greek subelement
-        greek = entry.find("greek")
-        if greek is not None:
-            unicode_value = greek.get("unicode")  
-            if unicode_value:
-                pronunciation = entry.find("pronunciation")
-                strongs_def = entry.find("strongs_def")
-                translit = greek.get("translit") if greek.get("translit") else None
-
-                # Use the new function to get the full text with asterisks
-                definition = get_full_text_with_asterisk(strongs_def) if strongs_def is not None else None
-
-                entry_dict = {
-                    'definition': definition,
-                    'pronunciation': pronunciation.get('strongs') if pronunciation is not None and pronunciation.get('strongs') else None,
-                    'transliteration': translit
-                }
-                unicode_to_entry[unicodedata.normalize("NFC",unicode_value)] = entry_dict
-
-    return unicode_to_entry
+class StrongsEntry:
+    """
+    One entry of the Strong's Greek dictionary.
+    Cross-references are kept as tuples of integer Strong's numbers, split by language;
+    derived_from holds the Greek numbers cited in the entry's derivation.
+    Uses __slots__ because the lexicon holds several thousand of these for the whole session.
+    """
+    __slots__ = (
+        'strongs', 'unicode', 'transliteration', 'pronunciation',
+        'definition', 'derivation', 'kjv_def', 'greek_refs', 'hebrew_refs', 'derived_from',
+    )
+
+    def __init__(self, strongs, unicode, transliteration=None, pronunciation=None,
+                 definition=None, derivation=None, kjv_def=None, greek_refs=(), hebrew_refs=(), derived_from=()):
+        self.strongs = strongs
+        self.unicode = unicode
+        self.transliteration = transliteration
+        self.pronunciation = pronunciation
+        self.definition = definition
+        self.derivation = derivation
+        self.kjv_def = kjv_def
+        self.greek_refs = greek_refs
+        self.hebrew_refs = hebrew_refs
+        self.derived_from = derived_from
+
+    def __eq__(self, other):
+        if not isinstance(other, StrongsEntry):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"StrongsEntry(G{self.strongs}, {self.unicode!r})"
+
+    def __reduce__(self):
+        # Positional constructor arguments unpickle much faster than the default slot state
+        return StrongsEntry, tuple(getattr(self, name) for name in self.__slots__)
+
+def parse_strongs_entry(entry):
+    """Extract (NFC unicode headword, StrongsEntry) from an <entry> element, or None if it has no headword."""
+    # Get the unicode value from the greek subelement
+    greek = entry.find("greek")
+    if greek is None:
+        return None
+    unicode_value = greek.get("unicode")
+    if not unicode_value:
+        return None
+    unicode_value = unicodedata.normalize("NFC", unicode_value)
+    pronunciation = entry.find("pronunciation")
+    strongs_def = entry.find("strongs_def")
+    derivation = entry.find("strongs_derivation")
+    kjv_def = entry.find("kjv_def")
+
+    greek_refs = []
+    hebrew_refs = []
+    for ref in entry.iter("strongsref"):
+        refs = hebrew_refs if ref.get("language") == "HEBREW" else greek_refs
+        number = int(ref.get("strongs"))
+        if number not in refs:
+            refs.append(number)
+    derived_from = []
+    if derivation is not None:
+        for ref in derivation.iter("strongsref"):
+            number = int(ref.get("strongs"))
+            if ref.get("language") != "HEBREW" and number not in derived_from:
+                derived_from.append(number)
+
+    return unicode_value, StrongsEntry(
+        strongs=int(entry.get("strongs")),
+        unicode=unicode_value,
+        transliteration=greek.get("translit") or None,
+        pronunciation=pronunciation.get('strongs') or None if pronunciation is not None else None,
+        definition=get_inline_text(strongs_def) if strongs_def is not None else None,
+        derivation=get_inline_text(derivation) or None if derivation is not None else None,
+        # KJV usage is written ":--word, word."; keep just the list of renderings
+        kjv_def=get_inline_text(kjv_def).lstrip(":-").strip() or None if kjv_def is not None else None,
+        greek_refs=tuple(greek_refs),
+        hebrew_refs=tuple(hebrew_refs),
+        derived_from=tuple(derived_from),
+    )
+
+def iter_strongs_entries(xml_file, progress=None):
+    """
+    Stream StrongsEntry records from strongsgreek.xml in file order, skipping entries without a headword.
+    The file is read with iterparse and each <entry> is discarded once extracted,
+    so the full DOM is never held in memory.
+    If given, progress is called with the fraction of the file read (0.0 to 1.0).
+    """
+    total_bytes = os.path.getsize(xml_file) or 1
+
+    with open(xml_file, "rb") as file:
+        parent = None
+        count = 0
+        for event, element in ET.iterparse(file, events=("start", "end")):
+            if event == "start":
+                if element.tag == "entries":
+                    parent = element
+                continue
+            if element.tag == "prologue":
+                element.clear()
+            if element.tag != "entry":
+                continue
+            parsed = parse_strongs_entry(element)
+            if parsed:
+                yield parsed[1]
+            # Finished entries are the only children of <entries>, so this frees them
+            if parent is not None:
+                parent.clear()
+            count += 1
+            if progress and count % 250 == 0:
+                progress(min(file.tell() / total_bytes, 1.0))
+
+def parse_strongs_greek(xml_file, progress=None):
+    """Parse the strongsgreek.xml file and build a lookup dictionary of StrongsEntry records by headword."""
+    return {entry.unicode: entry for entry in iter_strongs_entries(xml_file, progress)}
+
+def fold_greek(text):
+    """
+    Fold a Greek word for accent-insensitive matching: decompose, drop accents,
+    breathings and other combining marks, lower-case, and map final sigma to sigma.
+    Anything that is not a letter (hyphens, apostrophes, spaces) is dropped too.
+    """
+    decomposed = unicodedata.normalize("NFD", text)
+    letters = [ch for ch in decomposed.lower() if not unicodedata.combining(ch) and ch.isalpha()]
+    return ''.join(letters).replace("ς", "σ")
+
+def drop_movable_nu(folded):
+    """Drop a movable nu (final ν after ε or ι) from a folded word."""
+    if len(folded) > 2 and folded[-1] == "ν" and folded[-2] in "ει":
+        return folded[:-1]
+    return folded
+
+def collapse_doubled_letters(folded):
+    """Collapse doubled letters (Ἰωάννης/Ἰωάνης, ἀββα/ἀβα) in a folded word."""
+    return ''.join(ch for i, ch in enumerate(folded) if i == 0 or ch != folded[i - 1])
+
+# Fallback tiers for lemma lookup, in the order they are tried after an exact NFC match
+LEMMA_FOLD_TIERS = (
+    ('folded', fold_greek),
+    ('movable_nu', lambda text: drop_movable_nu(fold_greek(text))),
+    ('doubled_letters', lambda text: collapse_doubled_letters(drop_movable_nu(fold_greek(text)))),
+)
+
+def _common_prefix_length(a, b):
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
+
+class StrongsLexicon:
+    """
+    The Strong's Greek dictionary with its lookup indexes:
+    by_unicode (NFC headword), by_number (Strong's number) and derivatives, the
+    reverse of each entry's derived_from links. Together with derived_from these
+    form the derivation graph walked by derivation_chain and derived_words.
+    folded holds one index per LEMMA_FOLD_TIERS entry, mapping folded keys to the
+    Strong's numbers of the headwords that fold to them.
+    """
+
+    def __init__(self, entries):
+        self.by_unicode = {}
+        self.by_number = {}
+        derivatives = {}
+        for entry in entries:
+            self.by_unicode[entry.unicode] = entry
+            self.by_number[entry.strongs] = entry
+            for root in entry.derived_from:
+                derivatives.setdefault(root, []).append(entry.strongs)
+        self.derivatives = {root: tuple(numbers) for root, numbers in derivatives.items()}
+        self.folded = {}
+        for tier, fold in LEMMA_FOLD_TIERS:
+            index = {}
+            for strongs in sorted(self.by_number):
+                index.setdefault(fold(self.by_number[strongs].unicode), []).append(strongs)
+            self.folded[tier] = {key: tuple(numbers) for key, numbers in index.items()}
+
+    def __len__(self):
+        return len(self.by_unicode)
+
+    def get(self, unicode_value, default=None):
+        """Look up an entry by NFC headword, like the plain dictionary this replaces."""
+        return self.by_unicode.get(unicode_value, default)
+
+    def get_by_number(self, strongs):
+        return self.by_number.get(strongs)
+
+    def lookup(self, lemma):
+        """
+        Resolve a lemma through the fallback chain: exact NFC headword, then each
+        LEMMA_FOLD_TIERS index. Returns (entry, tier), with tier 'exact' or a tier
+        name, or (None, None) if nothing matches. When several headwords share a
+        folded key, the one sharing the longest NFC prefix with the lemma wins,
+        then the lowest Strong's number.
+        """
+        lemma = unicodedata.normalize("NFC", lemma)
+        entry = self.by_unicode.get(lemma)
+        if entry is not None:
+            return entry, 'exact'
+        for tier, fold in LEMMA_FOLD_TIERS:
+            numbers = self.folded[tier].get(fold(lemma))
+            if numbers:
+                best = max(numbers, key=lambda n: (_common_prefix_length(self.by_number[n].unicode, lemma), -n))
+                return self.by_number[best], tier
+        return None, None
+
+    def derivation_chain(self, strongs):
+        """
+        Follow the first derived_from link from an entry back to its root.
+        Returns the entries in order, starting with the entry itself.
+        """
+        chain = []
+        seen = set()
+        entry = self.by_number.get(strongs)
+        while entry is not None and entry.strongs not in seen:
+            chain.append(entry)
+            seen.add(entry.strongs)
+            entry = self.by_number.get(entry.derived_from[0]) if entry.derived_from else None
+        return chain
+
+    def derived_words(self, strongs, max_depth=None):
+        """
+        All entries derived, directly or indirectly, from a root, breadth-first.
+        Returns a list of (entry, depth) pairs; depth 1 are the direct derivatives.
+        """
+        result = []
+        seen = {strongs}
+        frontier = [strongs]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            next_frontier = []
+            for number in frontier:
+                for child in self.derivatives.get(number, ()):
+                    if child not in seen:
+                        seen.add(child)
+                        next_frontier.append(child)
+                        result.append((self.by_number[child], depth))
+            frontier = next_frontier
+        return result
+
+def build_strongs_lexicon(xml_file, progress=None):
+    """Parse strongsgreek.xml into a StrongsLexicon with its number index and derivation graph."""
+    return StrongsLexicon(iter_strongs_entries(xml_file, progress))
+
+STRONGS_CACHE_FILE = os.path.join(CACHE_DIR, "strongsgreek.pickle")
+STRONGS_CACHE_VERSION = 4
+
+def file_sha256(path):
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def load_cached(source_file, cache_file, version, build):
+    """
+    Return build(source_file), reusing a pickled result stored in cache_file.
+    The cache is valid when its version matches and the source file has the same
+    mtime and size, or failing that the same SHA-256 digest, as when it was written.
+    Otherwise the result is rebuilt and the cache replaced atomically.
+    """
+    stat = os.stat(source_file)
+    cached = None
+    if cache_file and os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as file:
+                cached = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            cached = None
+    if isinstance(cached, dict) and cached.get('version') == version:
+        if cached['mtime'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+            return cached['data']
+        digest = file_sha256(source_file)
+        if cached['sha256'] == digest:
+            # Only the timestamp changed; refresh it so the next load takes the fast path
+            _write_cache(cache_file, dict(cached, mtime=stat.st_mtime_ns, size=stat.st_size))
+            return cached['data']
+    else:
+        digest = file_sha256(source_file)
+    data = build(source_file)
+    if cache_file:
+        _write_cache(cache_file, {
+            'version': version,
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': digest,
+            'data': data,
+        })
+    return data
+
+def _write_cache(cache_file, payload):
+    """Write a cache payload to a temporary file and rename it into place."""
+    cache_dir = os.path.dirname(cache_file) or "."
+    os.makedirs(cache_dir, exist_ok=True)
+    # A unique temporary name, so concurrent writers of the same cache cannot collide
+    fd, tmp_file = tempfile.mkstemp(dir=cache_dir, prefix=os.path.basename(cache_file) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+def load_strongs_greek(xml_file, cache_file=STRONGS_CACHE_FILE, progress=None):
+    """
+    Return the StrongsLexicon for an XML file, indexes and graph included, using a
+    binary cache invalidated when the XML changes.
+    """
+    build = lambda path: build_strongs_lexicon(path, progress)
+    return load_cached(xml_file, cache_file, STRONGS_CACHE_VERSION, build)
+
+class BackgroundLoader:
+    """
+    Handle to a value that is loaded on a worker thread.
+    Call start() to begin loading; wait() blocks until the load has finished and returns
+    the value, re-raising any load error. The loader is called as loader(*args), or as
+    loader(*args, progress=callback) when track_progress is set, in which case the
+    progress attribute follows its reports.
+    """
+
+    def __init__(self, loader, *args, track_progress=False):
+        self._loader = loader
+        self._args = args
+        self._track_progress = track_progress
+        self._data = None
+        self._error = None
+        self._loaded = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.progress = 0.0
+
+    def start(self):
+        """Start loading in the background if not already started."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="background-loader", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        try:
+            if self._track_progress:
+                self._data = self._loader(*self._args, progress=self._set_progress)
+            else:
+                self._data = self._loader(*self._args)
+        except Exception as error:
+            self._error = error
+        finally:
+            self.progress = 1.0
+            self._loaded.set()
+
+    def _set_progress(self, fraction):
+        self.progress = fraction
+
+    def is_loaded(self):
+        return self._loaded.is_set()
+
+    def failed(self):
+        """True once the load has finished with an error."""
+        return self._loaded.is_set() and self._error is not None
+
+    def wait(self):
+        """Block until the value is loaded and return it, re-raising any load error."""
+        self.start()
+        self._loaded.wait()
+        if self._error is not None:
+            raise self._error
+        return self._data
+
+class LazyLexicon(BackgroundLoader):
+    """
+    Dictionary-like handle to a lexicon that is loaded on a worker thread, with progress.
+    The loader must return a dict-like object such as a StrongsLexicon; get() and lookup()
+    block only until the load has finished.
+    """
+
+    def __init__(self, loader, *args):
+        super().__init__(loader, *args, track_progress=True)
+
+    def get(self, key, default=None):
+        return self.wait().get(key, default)
+
+    def lookup(self, lemma):
+        return self.wait().lookup(lemma)
 
 def lookup_entry_by_unicode(unicode_value, lookup_dict):
-    """Look up an entry by its Unicode value and return the entry dict or None."""
+    """
+    Look up an entry by its Unicode value and return the entry or None.
+    Lexicons with a lookup() method (StrongsLexicon, LazyLexicon) also try their
+    accent- and breathing-insensitive fallbacks; plain dicts only match exactly.
+    """
+    if hasattr(lookup_dict, 'lookup'):
+        return lookup_dict.lookup(unicode_value)[0]
     return lookup_dict.get(unicodedata.normalize("NFC",unicode_value), None)
 
+def lemma_coverage(lexicon):
+    """
+    Resolve every distinct MorphGNT lemma in the NT against a StrongsLexicon.
+    Returns {tier: (distinct lemmas, word tokens)} with tier None for unresolved
+    lemmas, and the sorted list of unresolved lemmas.
+    """
+    token_counts = {}
+    for book_num, *_ in NEW_TESTAMENT:
+        for row in morphgnt_rows(book_num):
+            token_counts[row['lemma']] = token_counts.get(row['lemma'], 0) + 1
+    coverage = {}
+    unresolved = []
+    for lemma, tokens in token_counts.items():
+        _, tier = lexicon.lookup(lemma)
+        lemmas_so_far, tokens_so_far = coverage.get(tier, (0, 0))
+        coverage[tier] = (lemmas_so_far + 1, tokens_so_far + tokens)
+        if tier is None:
+            unresolved.append(lemma)
+    return coverage, sorted(unresolved)
+
       
 
 def chunks(lst, n):
@@ -108,6 +520,34 @@ def chunks(lst, n):
     for i in range(0, len(lst), n):
         yield lst[i:i + n]
 
+CCAT_POS_MAP = {
+    "A-": "Adjective",
+    "C-": "Conjunction",
+    "D-": "Adverb",
+    "I-": "Interjection",
+    "N-": "Noun",
+    "P-": "Preposition",
+    "RA": "Definite Article",
+    "RD": "Demonstrative Pronoun",
+    "RI": "Interrogative/Indefinite Pronoun",
+    "RP": "Personal Pronoun",
+    "RR": "Relative Pronoun",
+    "V-": "Verb",
+    "X-": "Particle",
+}
+
+# One (label, code -> value) pair per character position of a CCAT parse code
+CCAT_PARSE_FIELDS = (
+    ('Person', {'1': '1st person', '2': '2nd person', '3': '3rd person'}),
+    ('Tense', {'P': 'present', 'I': 'imperfect', 'F': 'future', 'A': 'aorist', 'X': 'perfect', 'Y': 'pluperfect'}),
+    ('Voice', {'A': 'active', 'M': 'middle', 'P': 'passive'}),
+    ('Mood', {'I': 'indicative', 'D': 'imperative', 'S': 'subjunctive', 'O': 'optative', 'N': 'infinitive', 'P': 'participle'}),
+    ('Case', {'N': 'nominative', 'G': 'genitive', 'D': 'dative', 'A': 'accusative'}),
+    ('Number', {'S': 'singular', 'P': 'plural'}),
+    ('Gender', {'M': 'masculine', 'F': 'feminine', 'N': 'neuter'}),
+    ('Degree', {'C': 'comparative', 'S': 'superlative'}),
+)
+
 def interpret_ccat_pos(ccat_pos):
     """
     Interpret the CCAT part of speech (ccat-pos) key.
@@ -118,27 +558,14 @@ def interpret_ccat_pos(ccat_pos):
     Returns:
         str: The description of the part of speech.
     """
-    pos_map = {
-        "A-": "Adjective",
-        "C-": "Conjunction",
-        "D-": "Adverb",
-        "I-": "Interjection",
-        "N-": "Noun",
-        "P-": "Preposition",
-        "RA": "Definite Article",
-        "RD": "Demonstrative Pronoun",
-        "RI": "Interrogative/Indefinite Pronoun",
-        "RP": "Personal Pronoun",
-        "RR": "Relative Pronoun",
-        "V-": "Verb",
-        "X-": "Particle",
-    }
-    return pos_map.get(ccat_pos, "Unknown Part of Speech")
+    return CCAT_POS_MAP.get(ccat_pos, "Unknown Part of Speech")
 
 
+@functools.lru_cache(maxsize=None)
 def interpret_ccat_parse(ccat_parse):
     """
     Interpret the CCAT parsing (ccat-parse) key.
+    Results are memoised; the NT uses only about a thousand distinct codes.
 
     Args:
         ccat_parse (str): The CCAT parsing key.
@@ -146,19 +573,8 @@ def interpret_ccat_parse(ccat_parse):
     Returns:
         str: A human-readable description of the grammatical information.
     """
-    parse_map = [
-        ('Person', {'1': '1st person', '2': '2nd person', '3': '3rd person'}),
-        ('Tense', {'P': 'present', 'I': 'imperfect', 'F': 'future', 'A': 'aorist', 'X': 'perfect', 'Y': 'pluperfect'}),
-        ('Voice', {'A': 'active', 'M': 'middle', 'P': 'passive'}),
-        ('Mood', {'I': 'indicative', 'D': 'imperative', 'S': 'subjunctive', 'O': 'optative', 'N': 'infinitive', 'P': 'participle'}),
-        ('Case', {'N': 'nominative', 'G': 'genitive', 'D': 'dative', 'A': 'accusative'}),
-        ('Number', {'S': 'singular', 'P': 'plural'}),
-        ('Gender', {'M': 'masculine', 'F': 'feminine', 'N': 'neuter'}),
-        ('Degree', {'C': 'comparative', 'S': 'superlative'}),
-    ]
-
     result = []
-    for i, (label, mapping) in enumerate(parse_map):
+    for i, (label, mapping) in enumerate(CCAT_PARSE_FIELDS):
         if i < len(ccat_parse):
             char = ccat_parse[i]
             if char != '-':
@@ -167,6 +583,27 @@ def interpret_ccat_parse(ccat_parse):
                     result.append(f"{value}")
     return ", ".join(result) if result else ccat_parse
 
+@functools.lru_cache(maxsize=None)
+def decode_morphology(ccat_pos, ccat_parse):
+    """Decode a (ccat-pos, ccat-parse) pair to (part of speech, parsing) descriptions, memoised per pair."""
+    return interpret_ccat_pos(ccat_pos), interpret_ccat_parse(ccat_parse)
+
+def decode_morphology_column(pos_codes, parse_codes):
+    """
+    Decode parallel columns of ccat-pos and ccat-parse codes in one call.
+    Each distinct pair is decoded once; returns a list of (part of speech, parsing) tuples.
+    """
+    pairs = list(zip(pos_codes, parse_codes))
+    table = {pair: decode_morphology(*pair) for pair in set(pairs)}
+    return [table[pair] for pair in pairs]
+
+def decode_words(words):
+    """
+    Decode the morphology of a list of word records, such as a verse from get_greek_text
+    or a whole book from load_greek_book.
+    """
+    return decode_morphology_column([word['pos'] for word in words], [word['parse'] for word in words])
+
 TAG_MAPS = {
     "ESV": {"book": "b", "chapter": "c", "verse": "v", "attr": "n"},
     "KJV": {"book": "book", "chapter": "chapter", "verse": "verse", "attr": "num"},
@@ -188,109 +625,624 @@ def get_verse_text_with_inline_tags(element):
             parts.append(child.tail)
     return ''.join(parts)
 
+# Book identifiers used by the English files that differ from our own
+ENGLISH_BOOK_ALIASES = {"Phlm": 18}
+
+# Process-wide cache of parsed English translations, keyed by upper-case translation name
+_english_verse_store = {}
+_english_verse_store_lock = threading.Lock()
+
+def english_file(translation):
+    """Path of a translation's XML file in the 'english' directory."""
+    return os.path.join("english", f"{translation.lower()}.xml")
+
+def iter_english_verses(file_path, translation="ESV"):
+    """
+    Stream the New Testament verses of an English translation file in a single pass.
+    Yields (book_num, chapter, verse, text); other books are skipped and each book's
+    elements are cleared once it has been read, so memory stays flat.
+    """
+    tags = TAG_MAPS.get(translation.upper(), TAG_MAPS["ESV"])
+    flatten_inline = translation.upper() == "KJV"
+    book_num = None
+    chapter = ""
+    for event, elem in ET.iterparse(file_path, events=("start", "end")):
+        if event == "start":
+            if elem.tag == tags['book']:
+                book_id = elem.get(tags['attr'])
+                book_num = get_book_number(book_id) or ENGLISH_BOOK_ALIASES.get(book_id)
+            elif elem.tag == tags['chapter']:
+                chapter = elem.get(tags['attr'], "")
+        elif elem.tag == tags['verse']:
+            verse = elem.get(tags['attr'], "")
+            if book_num is not None and chapter.isdigit() and verse.isdigit():
+                if flatten_inline:
+                    text = get_verse_text_with_inline_tags(elem).strip()
+                else:
+                    text = elem.text.strip() if elem.text else ""
+                yield book_num, int(chapter), int(verse), text
+        elif elem.tag == tags['book']:
+            elem.clear()
+
+def parse_english_verses(file_path, translation="ESV"):
+    """
+    Parse an English translation file into a verse index.
+    Only New Testament books are kept. Returns (verses, chapters) where verses maps
+    (book_num, chapter, verse) to the rendered text and chapters is the set of
+    (book_num, chapter) pairs present in the file.
+    """
+    verses = {}
+    chapters = set()
+    for book_num, chapter, verse, text in iter_english_verses(file_path, translation):
+        chapters.add((book_num, chapter))
+        verses[(book_num, chapter, verse)] = text
+    return verses, chapters
+
+def load_english_verses(translation="ESV"):
+    """Return the (verses, chapters) index for a translation, parsing its file only on first use."""
+    key = translation.upper()
+    with _english_verse_store_lock:
+        if key not in _english_verse_store:
+            _english_verse_store[key] = parse_english_verses(english_file(translation), translation)
+        return _english_verse_store[key]
+
 def lookup_english_verse(book_name, chapter, verse, translation="ESV"):
     """
     Look up a verse from a specified file in the 'english' directory.
     Handles inline tags for KJV (e.g., <i>, <span>), including their text and tails.
-    Tries all known abbreviations for the book before reporting missing book.
+    The file is parsed once per process; later lookups are dictionary hits.
     """
-    file_path = f"english/{translation.lower()}.xml"
-    tags = TAG_MAPS.get(translation.upper(), TAG_MAPS["ESV"])
-    # Try all possible book identifiers
-    book_data = get_book_data(book_name)
-    tried = set()
-    tried.add(book_name)
-    tried_abbrevs = []
-    if book_data:
-        # Try canonical, short, and KJV abbrevs
-        candidates = [book_name]
-        if isinstance(book_data, tuple):
-            # Add all known abbreviations
-            for val in book_data:
-                if isinstance(val, str) and val not in candidates:
-                    candidates.append(val)
-        for candidate in candidates:
-            try:
-                tree = ET.parse(file_path)
-                root = tree.getroot()
-                book_element = None
-                for b in root.findall(f".//{tags['book']}"):
-                    if b.get(tags['attr']) == str(candidate):
-                        book_element = b
-                        break
-                if book_element is not None:
-                    chapter_element = None
-                    for c in book_element.findall(f".//{tags['chapter']}"):
-                        if c.get(tags['attr']) == str(chapter):
-                            chapter_element = c
-                            break
-                    if chapter_element is None:
-                        return f"Chapter {chapter} not found in {candidate} ({translation})."
-                    verse_element = None
-                    for v in chapter_element.findall(f".//{tags['verse']}"):
-                        if v.get(tags['attr']) == str(verse):
-                            verse_element = v
-                            break
-                    if verse_element is None:
-                        return f"Verse {verse} not found in {candidate} {chapter} ({translation})."
-                    if translation.upper() == "KJV":
-                        return get_verse_text_with_inline_tags(verse_element).strip()
-                    return verse_element.text.strip() if verse_element.text else ""
-            except FileNotFoundError:
-                return f"Translation file '{translation.lower()}.xml' not found in 'english' directory."
-            except ET.ParseError:
-                return f"Error parsing the file '{translation.lower()}.xml'. Please check the file format."
-    return f"Book '{book_name}' not found in {translation} translation."
+    try:
+        verses, chapters = load_english_verses(translation)
+    except FileNotFoundError:
+        return f"Translation file '{translation.lower()}.xml' not found in 'english' directory."
+    except ET.ParseError:
+        return f"Error parsing the file '{translation.lower()}.xml'. Please check the file format."
+    book_num = get_book_number(book_name)
+    try:
+        chapter, verse = int(chapter), int(verse)
+    except (TypeError, ValueError):
+        return f"Invalid reference: {book_name} {chapter}:{verse}"
+    text = verses.get((book_num, chapter, verse))
+    if text is not None:
+        return text
+    if book_num is None or not any(b == book_num for b, _ in chapters):
+        return f"Book '{book_name}' not found in {translation} translation."
+    if (book_num, chapter) not in chapters:
+        return f"Chapter {chapter} not found in {book_name} ({translation})."
+    return f"Verse {verse} not found in {book_name} {chapter} ({translation})."
 
 USERDATA_DIR = "userdata"
+# Snapshot of all user translations, in the original nested {book: {chapter: {verse: text}}} format
 USER_TRANSLATIONS_FILE = os.path.join(USERDATA_DIR, "usertranslations.json")
+# Per-verse saves since the last snapshot, one JSON record per line
+USER_TRANSLATIONS_JOURNAL = os.path.join(USERDATA_DIR, "usertranslations.journal")
+# Fold the journal into the snapshot once it grows past this size
+JOURNAL_COMPACT_BYTES = 1 << 20
 
-def load_user_translations():
-    """Load user translations from a JSON file."""
-    if not os.path.exists(USER_TRANSLATIONS_FILE):
-        return {}
-    with open(USER_TRANSLATIONS_FILE, "r", encoding="utf-8") as file:
-        return json.load(file)
+def replay_journal(translations, journal_file=USER_TRANSLATIONS_JOURNAL):
+    """Apply the journal records to a translations dictionary, skipping any torn record."""
+    if not os.path.exists(journal_file):
+        return translations
+    with open(journal_file, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Partially written record from an interrupted save
+            translations.setdefault(record['book'], {}).setdefault(str(record['chapter']), {})[str(record['verse'])] = record['text']
+    return translations
 
-def save_user_translation(book, chapter, verse, translation):
-    """Save a user translation to the JSON file."""
+def read_user_translations():
+    """Read user translations from the JSON snapshot plus any journaled saves."""
+    translations = {}
+    if os.path.exists(USER_TRANSLATIONS_FILE):
+        with open(USER_TRANSLATIONS_FILE, "r", encoding="utf-8") as file:
+            translations = json.load(file)
+    return replay_journal(translations)
+
+def append_journal_record(book, chapter, verse, translation, journal_file=USER_TRANSLATIONS_JOURNAL):
+    """Durably append one verse to the journal."""
+    os.makedirs(os.path.dirname(journal_file) or ".", exist_ok=True)
+    line = json.dumps({'book': book, 'chapter': chapter, 'verse': verse, 'text': translation}, ensure_ascii=False) + "\n"
+    with open(journal_file, "ab") as file:
+        # Terminate a record torn by an earlier crash so it cannot swallow this one
+        if file.tell() > 0:
+            with open(journal_file, "rb") as reader:
+                reader.seek(-1, os.SEEK_END)
+                if reader.read(1) != b"\n":
+                    file.write(b"\n")
+        file.write(line.encode("utf-8"))
+        file.flush()
+        os.fsync(file.fileno())
+
+def compact_user_translations(translations=None):
+    """Fold the journal into a new snapshot, replacing the old one atomically."""
+    if translations is None:
+        translations = read_user_translations()
     os.makedirs(USERDATA_DIR, exist_ok=True)
-    translations = load_user_translations()
-    translations.setdefault(book, {}).setdefault(str(chapter), {})[str(verse)] = translation
-    with open(USER_TRANSLATIONS_FILE, "w", encoding="utf-8") as file:
+    tmp_file = f"{USER_TRANSLATIONS_FILE}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as file:
         json.dump(translations, file, indent=4)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_file, USER_TRANSLATIONS_FILE)
+    # Replaying the journal onto the new snapshot is harmless, so a crash here loses nothing
+    if os.path.exists(USER_TRANSLATIONS_JOURNAL):
+        os.remove(USER_TRANSLATIONS_JOURNAL)
+    return translations
+
+class UserTranslationRepository:
+    """
+    In-memory copy of the user's translations.
+    Saves write through to the journal; the files are only re-read when their
+    mtime or size shows that something else has changed them.
+    """
+
+    def __init__(self):
+        self._translations = None
+        self._signature = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _file_signature():
+        signature = []
+        for path in (USER_TRANSLATIONS_FILE, USER_TRANSLATIONS_JOURNAL):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def load_all(self):
+        """Return the nested translations dictionary. Callers must not modify it."""
+        with self._lock:
+            signature = self._file_signature()
+            if self._translations is None or signature != self._signature:
+                self._translations = read_user_translations()
+                self._signature = signature
+            return self._translations
+
+    def get(self, book, chapter, verse):
+        return self.load_all().get(book, {}).get(str(chapter), {}).get(str(verse))
+
+    def iter_range(self, book, start_chapter, start_verse, end_chapter, end_verse):
+        """Yield (book, chapter, verse, text) for the saved verses of one book within a range, in order."""
+        chapters = self.load_all().get(book, {})
+        for chapter in sorted(int(ch) for ch in chapters):
+            if not start_chapter <= chapter <= end_chapter:
+                continue
+            verses = chapters[str(chapter)]
+            for verse in sorted(int(vs) for vs in verses):
+                if (chapter, verse) < (start_chapter, start_verse) or (chapter, verse) > (end_chapter, end_verse):
+                    continue
+                yield book, chapter, verse, verses[str(verse)]
+
+    def iter_all(self):
+        """Yield (book, chapter, verse, text) for every saved verse in canonical order."""
+        translations = self.load_all()
+        books = sorted(translations, key=lambda book: get_book_number(book) or len(NEW_TESTAMENT) + 1)
+        for book in books:
+            yield from self.iter_range(book, 0, 0, float('inf'), float('inf'))
+
+    def save(self, book, chapter, verse, translation):
+        with self._lock:
+            translations = self.load_all()
+            append_journal_record(book, chapter, verse, translation)
+            translations.setdefault(book, {}).setdefault(str(chapter), {})[str(verse)] = translation
+            if os.path.getsize(USER_TRANSLATIONS_JOURNAL) > JOURNAL_COMPACT_BYTES:
+                compact_user_translations(translations)
+            self._signature = self._file_signature()
+
+USER_TRANSLATIONS_DB = os.path.join(USERDATA_DIR, "usertranslations.sqlite3")
+
+class SQLiteUserTranslationStore:
+    """
+    User translations stored in SQLite with a (book_num, chapter, verse) primary key.
+    Offers the same interface as UserTranslationRepository; range and full exports
+    are index scans that stream rows in canonical order.
+    """
+
+    def __init__(self, db_file=USER_TRANSLATIONS_DB):
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        self.db_file = db_file
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " book_num INTEGER NOT NULL,"
+                " chapter INTEGER NOT NULL,"
+                " verse INTEGER NOT NULL,"
+                " text TEXT NOT NULL,"
+                " PRIMARY KEY (book_num, chapter, verse)"
+                ") WITHOUT ROWID"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+    def is_empty(self):
+        return self._conn.execute("SELECT 1 FROM translations LIMIT 1").fetchone() is None
+
+    def get(self, book, chapter, verse):
+        row = self._conn.execute(
+            "SELECT text FROM translations WHERE book_num = ? AND chapter = ? AND verse = ?",
+            (get_book_number(book), chapter, verse)).fetchone()
+        return row[0] if row else None
+
+    def save(self, book, chapter, verse, translation):
+        book_num = get_book_number(book)
+        if book_num is None:
+            raise ValueError(f"Unknown book: {book}")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations (book_num, chapter, verse, text) VALUES (?, ?, ?, ?)",
+                (book_num, chapter, verse, translation))
+            self._conn.commit()
+
+    @staticmethod
+    def _translation_rows(translations):
+        """Flatten a nested {book: {chapter: {verse: text}}} dictionary into {(book_num, chapter, verse): text}."""
+        rows = {}
+        for book, chapters in translations.items():
+            book_num = get_book_number(book)
+            if book_num is None:
+                continue
+            for chapter, verses in chapters.items():
+                for verse, text in verses.items():
+                    rows[(book_num, int(chapter), int(verse))] = text
+        return rows
+
+    def _write_rows(self, rows):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO translations (book_num, chapter, verse, text) VALUES (?, ?, ?, ?)",
+            (key + (text,) for key, text in rows.items()))
+
+    def _get_meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def import_translations(self, translations):
+        """Insert every verse of a nested {book: {chapter: {verse: text}}} dictionary; returns the row count."""
+        rows = self._translation_rows(translations)
+        with self._lock:
+            self._write_rows(rows)
+            self._conn.commit()
+        return len(rows)
+
+    def sync_from_json(self):
+        """
+        Import the verses saved with the JSON backend since this database last read the JSON files.
+        The JSON data seen at the last sync is kept in the meta table; any verse whose JSON text
+        differs from it was saved later than the database copy, so it replaces the row (last write wins).
+        Returns the number of verses imported.
+        """
+        signature = json.dumps(UserTranslationRepository._file_signature())
+        with self._lock:
+            if self._get_meta('json_signature') == signature:
+                return 0
+            current = read_user_translations()
+            base = self._get_meta('json_base')
+            if base is not None:
+                base_rows = self._translation_rows(json.loads(base))
+                rows = {key: text for key, text in self._translation_rows(current).items()
+                        if base_rows.get(key) != text}
+            elif self.is_empty():
+                rows = self._translation_rows(current)
+            else:
+                # Database from before the sync was recorded: only add the verses it is missing
+                existing = {(book_num, chapter, verse) for book_num, chapter, verse in
+                            self._conn.execute("SELECT book_num, chapter, verse FROM translations")}
+                rows = {key: text for key, text in self._translation_rows(current).items() if key not in existing}
+            self._write_rows(rows)
+            self._set_meta('json_base', json.dumps(current, ensure_ascii=False))
+            self._set_meta('json_signature', signature)
+            self._conn.commit()
+        return len(rows)
+
+    def _iter_rows(self, query, params):
+        for book_num, chapter, verse, text in self._conn.execute(query, params):
+            yield NUMBER_TO_DATA[book_num][0], chapter, verse, text
+
+    def iter_range(self, book, start_chapter, start_verse, end_chapter, end_verse):
+        """Yield (book, chapter, verse, text) for the saved verses of one book within a range, in order."""
+        return self._iter_rows(
+            "SELECT book_num, chapter, verse, text FROM translations"
+            " WHERE book_num = ? AND (chapter, verse) >= (?, ?) AND (chapter, verse) <= (?, ?)"
+            " ORDER BY chapter, verse",
+            (get_book_number(book), start_chapter, start_verse, end_chapter, end_verse))
+
+    def iter_all(self):
+        """Yield (book, chapter, verse, text) for every saved verse in canonical order."""
+        return self._iter_rows(
+            "SELECT book_num, chapter, verse, text FROM translations ORDER BY book_num, chapter, verse", ())
+
+    def load_all(self):
+        """Return all translations as the nested dictionary used by the JSON files."""
+        translations = {}
+        for book, chapter, verse, text in self.iter_all():
+            translations.setdefault(book, {}).setdefault(str(chapter), {})[str(verse)] = text
+        return translations
+
+def migrate_user_translations_to_sqlite(db_file=USER_TRANSLATIONS_DB):
+    """Copy the JSON snapshot and journal into a SQLite store and return the store."""
+    store = SQLiteUserTranslationStore(db_file)
+    store.import_translations(read_user_translations())
+    return store
+
+# Shared repository used by the module-level helpers below
+user_translations = UserTranslationRepository()
+
+def use_user_translation_backend(backend):
+    """
+    Select where user translations are stored: "json" (default) or "sqlite", in any case.
+    Switching to SQLite imports the JSON data saved since the database last synced with it,
+    so translations made while the JSON backend was selected are not lost.
+    Saves made with SQLite are not copied back to the JSON files.
+    """
+    global user_translations
+    backend = backend.strip().lower()
+    if backend == "sqlite":
+        if isinstance(user_translations, SQLiteUserTranslationStore):
+            return user_translations
+        store = SQLiteUserTranslationStore()
+        store.sync_from_json()
+        user_translations = store
+    elif backend == "json":
+        if not isinstance(user_translations, UserTranslationRepository):
+            user_translations = UserTranslationRepository()
+    else:
+        raise ValueError(f"Unknown translation storage backend: {backend}")
+    return user_translations
+
+def get_user_translations():
+    """Return the active user translation store."""
+    return user_translations
+
+def load_user_translations():
+    """Load all user translations (served from memory unless the files changed)."""
+    return user_translations.load_all()
+
+# Callbacks run after every save_user_translation, e.g. to keep search indexes current
+_user_translation_listeners = []
+
+def add_user_translation_listener(callback):
+    """Call callback(book, chapter, verse, old_text, new_text) after each saved translation."""
+    _user_translation_listeners.append(callback)
+
+def save_user_translation(book, chapter, verse, translation):
+    """Save a user translation, writing it through to the journal, and notify the listeners."""
+    old_translation = user_translations.get(book, chapter, verse) if _user_translation_listeners else None
+    user_translations.save(book, chapter, verse, translation)
+    for callback in _user_translation_listeners:
+        callback(book, chapter, verse, old_translation, translation)
 
 def load_user_translation(book, chapter, verse):
-    """Load a specific user translation from the JSON file."""
-    if not os.path.exists(USER_TRANSLATIONS_FILE):
-        return None  # Return None if the file doesn't exist
+    """Load a specific user translation."""
+    return user_translations.get(book, chapter, verse)
+
+class UserTranslationIndex:
+    """
+    A shared value derived from all user translations and kept current on every save.
+    load() builds it once with build(verses) from the active store's iter_all(), without
+    holding any lock a save needs: saves made during the build are queued, applied with
+    update(value, book, chapter, verse, text) and only then is the value published.
+    update must replace the verse's previous contribution, as a queued save may also be
+    in the verses the build read.
+    """
 
-    with open(USER_TRANSLATIONS_FILE, "r", encoding="utf-8") as file:
-        translations = json.load(file)
+    def __init__(self, build, update):
+        self._build = build
+        self._update = update
+        self._value = None
+        self._pending = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        add_user_translation_listener(self._on_saved)
 
-    # Navigate to the specific translation if it exists
-    return translations.get(book, {}).get(str(chapter), {}).get(str(verse))
+    def _on_saved(self, book, chapter, verse, old_text, new_text):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((book, chapter, verse, new_text))
+                return
+            value = self._value
+        if value is not None:
+            self._update(value, book, chapter, verse, new_text)
+
+    def load(self):
+        """Return the value, building it on first use."""
+        with self._load_lock:
+            if self._value is None:
+                with self._lock:
+                    self._pending = []
+                try:
+                    value = self._build(list(get_user_translations().iter_all()))
+                    while True:
+                        with self._lock:
+                            saves, self._pending = self._pending, []
+                            if not saves:
+                                self._value, self._pending = value, None
+                                break
+                        for save in saves:
+                            self._update(value, *save)
+                except Exception:
+                    with self._lock:
+                        self._pending = None
+                    raise
+            return self._value
+
+# Per-book MorphGNT verse index, keyed by book number
+_greek_book_store = {}
+_greek_book_store_lock = threading.Lock()
+
+def build_greek_book_index(book_num):
+    """
+    Read a book from MorphGNT once and index it by verse.
+    Returns (words, verse_slices) where words is the book's word records in order and
+    verse_slices maps (chapter, verse) to the (start, end) slice of words for that verse.
+    """
+    words = []
+    verse_slices = {}
+    current = None
+    start = 0
+    for row in morphgnt_rows(book_num):
+        # Extract chapter and verse from the 'bcv' key
+        key = (int(row['bcv'][2:4]), int(row['bcv'][4:]))
+        if key != current:
+            if current is not None:
+                verse_slices[current] = (start, len(words))
+            current = key
+            start = len(words)
+        words.append({
+            'text': row['text'],
+            'word': row['word'],
+            'lemma': row['lemma'],
+            'pos': row['ccat-pos'],
+            'parse': row['ccat-parse']
+        })
+    if current is not None:
+        verse_slices[current] = (start, len(words))
+    return words, verse_slices
+
+def load_greek_book(book_num):
+    """
+    Return the (words, verse_slices) index for a book, building it on first use.
+    When the prebuilt corpus file exists the book is sliced out of it, so MorphGNT is not read.
+    """
+    with _greek_book_store_lock:
+        if book_num in _greek_book_store:
+            return _greek_book_store[book_num]
+    # Imported here because corpus.py builds on this module; called without the store lock
+    # so a reader never waits on the corpus module's locks
+    from corpus import load_corpus_file
+    corpus = load_corpus_file()
+    with _greek_book_store_lock:
+        if book_num not in _greek_book_store:
+            if corpus is not None:
+                _greek_book_store[book_num] = corpus.book_index(book_num)
+            else:
+                _greek_book_store[book_num] = build_greek_book_index(book_num)
+        return _greek_book_store[book_num]
 
 def get_greek_text(book, chapter, verse):
     """Retrieve the Greek text, words, and lemmas for a specific verse from MorphGNT data."""
-    book_num = get_book_data(book)[0]  # Get the book number from NEW_TESTAMENT
-    verse_text = []
+    book_num = get_book_number(book)
+    if book_num is None:
+        return []
+    words, verse_slices = load_greek_book(book_num)
+    start, end = verse_slices.get((chapter, verse), (0, 0))
+    return words[start:end]
 
-    for row in morphgnt_rows(book_num):
-        # Extract book, chapter, and verse from the 'bcv' key
-        b, c, v = map(int, [row['bcv'][:2], row['bcv'][2:4], row['bcv'][4:]])
+VERSIFICATION_FILE = os.path.join(CACHE_DIR, "versification.json")
+VERSIFICATION_VERSION = 1
 
-        if b == book_num and c == chapter and v == verse:
-            # Collect the text, word, and lemma for the verse
-            verse_text.append({
-                'text': row['text'],
-                'word': row['word'],
-                'lemma': row['lemma'],
-                'pos': row['ccat-pos'],
-                'parse': row['ccat-parse']
-            })
+# Versification table: book number -> list of verse counts, one per chapter
+_versification = None
+# Ordinal of the first verse slot of each chapter: book number -> list, one per chapter
+_chapter_ordinals = None
+_versification_lock = threading.Lock()
 
-    return verse_text
+def build_versification():
+    """Derive chapters per book and verses per chapter from MorphGNT with a single pass per book."""
+    table = {}
+    for book_num, *_ in NEW_TESTAMENT:
+        counts = []
+        for row in morphgnt_rows(book_num):
+            c = int(row['bcv'][2:4])
+            v = int(row['bcv'][4:])
+            while len(counts) < c:
+                counts.append(0)
+            if v > counts[c - 1]:
+                counts[c - 1] = v
+        table[book_num] = counts
+    return table
+
+def load_versification(cache_file=VERSIFICATION_FILE):
+    """
+    Return the NT versification table, building it on first use.
+    When cache_file is given the table is read from it if present and valid,
+    otherwise it is derived from MorphGNT and written there for the next run.
+    """
+    with _versification_lock:
+        if _versification is not None:
+            return _versification
+        table = None
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                if data.get('version') == VERSIFICATION_VERSION:
+                    table = {int(b): counts for b, counts in data['books'].items()}
+            except (OSError, ValueError, KeyError):
+                table = None
+        if table is None:
+            table = build_versification()
+            if cache_file:
+                os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+                with open(cache_file, "w", encoding="utf-8") as file:
+                    json.dump({'version': VERSIFICATION_VERSION, 'books': table}, file)
+        _set_versification(table)
+        return _versification
+
+def _set_versification(table):
+    global _versification, _chapter_ordinals
+    ordinals = {}
+    total = 0
+    for book_num, *_ in NEW_TESTAMENT:
+        ordinals[book_num] = []
+        for count in table.get(book_num, []):
+            ordinals[book_num].append(total)
+            total += count
+    _versification, _chapter_ordinals = table, ordinals
+
+def seed_versification(table):
+    """Use a versification table read elsewhere (e.g. the corpus file header) unless one is already loaded."""
+    with _versification_lock:
+        if _versification is None:
+            _set_versification({int(b): list(counts) for b, counts in table.items()})
+
+def get_chapter_count(book):
+    """Number of chapters in a book."""
+    return len(load_versification().get(get_book_number(book), []))
+
+def get_verse_count(book, chapter):
+    """Highest verse number in a chapter, or 0 if the chapter does not exist."""
+    counts = load_versification().get(get_book_number(book), [])
+    return counts[chapter - 1] if 1 <= chapter <= len(counts) else 0
+
+def verse_ordinal(book, chapter, verse):
+    """
+    Global 0-based position of a verse in the NT canon, or None if out of range.
+    Every verse number up to a chapter's highest is counted, including the few
+    verses that the SBLGNT text omits.
+    """
+    book_num = get_book_number(book)
+    if not 1 <= verse <= get_verse_count(book_num, chapter):
+        return None
+    return _chapter_ordinals[book_num][chapter - 1] + verse - 1
+
+def verse_from_ordinal(ordinal):
+    """Inverse of verse_ordinal: return (book_name, chapter, verse), or None if out of range."""
+    load_versification()
+    if ordinal < 0:
+        return None
+    book_starts = [_chapter_ordinals[b][0] for b, *_ in NEW_TESTAMENT]
+    book_idx = bisect.bisect_right(book_starts, ordinal) - 1
+    book_num = NEW_TESTAMENT[book_idx][0]
+    chapter_idx = bisect.bisect_right(_chapter_ordinals[book_num], ordinal) - 1
+    verse = ordinal - _chapter_ordinals[book_num][chapter_idx] + 1
+    if verse > _versification[book_num][chapter_idx]:
+        return None
+    return (NUMBER_TO_DATA[book_num][0], chapter_idx + 1, verse)
 
 def navigate_verse(current_book, current_chapter, current_verse, mode):
     """
@@ -303,95 +1255,56 @@ def navigate_verse(current_book, current_chapter, current_verse, mode):
     Returns:
         (book_name, chapter, verse): The target book, chapter, and verse after navigation.
     """
-    # Get canonical book data
-    book_data = get_book_data(current_book)
-    if not book_data:
+    book_num = get_book_number(current_book)
+    if book_num is None:
         raise ValueError(f"Unknown book: {current_book}")
-    book_num = book_data[0]
-    # Find the index of the book in NEW_TESTAMENT
-    book_idx = None
-    for idx, book in enumerate(NEW_TESTAMENT):
-        if book[0] == book_num:
-            book_idx = idx
-            break
-    if book_idx is None:
-        raise ValueError(f"Book not found in NEW_TESTAMENT: {current_book}")
-    # Helper to get max chapter and verse for a book
-    def get_max_chapter(book_num):
-        # Find the highest chapter number in the morphgnt_rows for this book
-        max_chapter = 0
-        for row in morphgnt_rows(book_num):
-            c = int(row['bcv'][2:4])
-            if c > max_chapter:
-                max_chapter = c
-        return max_chapter
-    def get_max_verse(book_num, chapter):
-        max_verse = 0
-        for row in morphgnt_rows(book_num):
-            c = int(row['bcv'][2:4])
-            v = int(row['bcv'][4:])
-            if c == chapter and v > max_verse:
-                max_verse = v
-        return max_verse
+    book_name = NUMBER_TO_DATA[book_num][0]
+    prev_book = NUMBER_TO_DATA.get(book_num - 1)
+    next_book = NUMBER_TO_DATA.get(book_num + 1)
     # Navigation logic
     if mode == 'next_verse':
-        max_verse = get_max_verse(book_num, current_chapter)
-        if current_verse < max_verse:
-            return (NUMBER_TO_DATA[book_num][0], current_chapter, current_verse + 1)
+        if current_verse < get_verse_count(book_num, current_chapter):
+            return (book_name, current_chapter, current_verse + 1)
+        elif current_chapter < get_chapter_count(book_num):
+            return (book_name, current_chapter + 1, 1)
+        elif next_book:
+            # Move to next book
+            return (next_book[0], 1, 1)
         else:
-            max_chapter = get_max_chapter(book_num)
-            if current_chapter < max_chapter:
-                return (NUMBER_TO_DATA[book_num][0], current_chapter + 1, 1)
-            elif book_idx < len(NEW_TESTAMENT) - 1:
-                # Move to next book
-                next_book = NEW_TESTAMENT[book_idx + 1]
-                next_book_num = next_book[0]
-                return (next_book[1], 1, 1)
-            else:
-                # At end of Revelation
-                return (NUMBER_TO_DATA[book_num][0], current_chapter, current_verse)
+            # At end of Revelation
+            return (book_name, current_chapter, current_verse)
     elif mode == 'previous_verse':
         if current_verse > 1:
-            return (NUMBER_TO_DATA[book_num][0], current_chapter, current_verse - 1)
+            return (book_name, current_chapter, current_verse - 1)
         elif current_chapter > 1:
             prev_chapter = current_chapter - 1
-            prev_max_verse = get_max_verse(book_num, prev_chapter)
-            return (NUMBER_TO_DATA[book_num][0], prev_chapter, prev_max_verse)
-        elif book_idx > 0:
+            return (book_name, prev_chapter, get_verse_count(book_num, prev_chapter))
+        elif prev_book:
             # Move to previous book
-            prev_book = NEW_TESTAMENT[book_idx - 1]
-            prev_book_num = prev_book[0]
-            prev_max_chapter = get_max_chapter(prev_book_num)
-            prev_max_verse = get_max_verse(prev_book_num, prev_max_chapter)
-            return (prev_book[1], prev_max_chapter, prev_max_verse)
+            prev_max_chapter = get_chapter_count(book_num - 1)
+            return (prev_book[0], prev_max_chapter, get_verse_count(book_num - 1, prev_max_chapter))
         else:
             # At start of Matthew
-            return (NUMBER_TO_DATA[book_num][0], current_chapter, current_verse)
+            return (book_name, current_chapter, current_verse)
     elif mode == 'start_of_chapter':
         if current_verse == 1:
             # Already at start of chapter, go to start of previous chapter if possible
             if current_chapter > 1:
-                return (NUMBER_TO_DATA[book_num][0], current_chapter - 1, 1)
-            elif book_idx > 0:
+                return (book_name, current_chapter - 1, 1)
+            elif prev_book:
                 # Move to previous book's last chapter
-                prev_book = NEW_TESTAMENT[book_idx - 1]
-                prev_book_num = prev_book[0]
-                prev_max_chapter = get_max_chapter(prev_book_num)
-                return (prev_book[1], prev_max_chapter, 1)
+                return (prev_book[0], get_chapter_count(book_num - 1), 1)
             else:
                 # At very start of Matthew
-                return (NUMBER_TO_DATA[book_num][0], current_chapter, current_verse)
+                return (book_name, current_chapter, current_verse)
         else:
-            return (NUMBER_TO_DATA[book_num][0], current_chapter, 1)
+            return (book_name, current_chapter, 1)
     elif mode == 'start_of_next_chapter':
-        max_chapter = get_max_chapter(book_num)
-        if current_chapter < max_chapter:
-            return (NUMBER_TO_DATA[book_num][0], current_chapter + 1, 1)
-        elif book_idx < len(NEW_TESTAMENT) - 1:
-            next_book = NEW_TESTAMENT[book_idx + 1]
-            return (next_book[1], 1, 1)
+        if current_chapter < get_chapter_count(book_num):
+            return (book_name, current_chapter + 1, 1)
+        elif next_book:
+            return (next_book[0], 1, 1)
         else:
-            return (NUMBER_TO_DATA[book_num][0], current_chapter, current_verse)
+            return (book_name, current_chapter, current_verse)
     else:
         raise ValueError(f"Unknown navigation mode: {mode}")
-
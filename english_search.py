@@ -0,0 +1,155 @@
+"""
+Ranked full-text search over the New Testament in the English translations.
+
+The verses are indexed once into an SQLite FTS5 table under cache/ and the file is
+rebuilt only when a translation file changes. Queries take words, prefix* terms and
+"quoted phrases"; results are ranked by BM25.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+
+from data_structures import CACHE_DIR, NUMBER_TO_DATA, english_file, iter_english_verses
+
+ENGLISH_INDEX_FILE = os.path.join(CACHE_DIR, "english_fts.sqlite3")
+ENGLISH_INDEX_VERSION = 1
+ENGLISH_TRANSLATIONS = ("ESV", "KJV")
+
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def source_signature(translations=ENGLISH_TRANSLATIONS):
+    """JSON summary of the version and the translation files' mtimes and sizes."""
+    files = {}
+    for translation in translations:
+        try:
+            stat = os.stat(english_file(translation))
+            files[translation] = [stat.st_mtime_ns, stat.st_size]
+        except FileNotFoundError:
+            files[translation] = None
+    return json.dumps({'version': ENGLISH_INDEX_VERSION, 'files': files}, sort_keys=True)
+
+
+def build_english_index(db_file=ENGLISH_INDEX_FILE, translations=ENGLISH_TRANSLATIONS):
+    """
+    Index the NT verses of each translation with one streaming pass per file.
+    The database is written to a temporary file and moved into place, so open readers
+    keep a consistent view. Returns the number of verses indexed.
+    """
+    os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+    tmp_file = f"{db_file}.tmp"
+    if os.path.exists(tmp_file):
+        os.remove(tmp_file)
+    conn = sqlite3.connect(tmp_file)
+    count = 0
+    try:
+        conn.execute(
+            "CREATE VIRTUAL TABLE verses USING fts5("
+            "text, translation UNINDEXED, book_num UNINDEXED, chapter UNINDEXED, verse UNINDEXED)")
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        for translation in translations:
+            if not os.path.exists(english_file(translation)):
+                continue
+            rows = ((text, translation, book_num, chapter, verse)
+                    for book_num, chapter, verse, text in iter_english_verses(english_file(translation), translation))
+            count += conn.executemany("INSERT INTO verses VALUES (?, ?, ?, ?, ?)", rows).rowcount
+        conn.execute("INSERT INTO verses (verses) VALUES ('optimize')")
+        conn.execute("INSERT INTO meta VALUES ('signature', ?)", (source_signature(translations),))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_file, db_file)
+    return count
+
+
+def fts_query(query):
+    """
+    Turn a user query into an FTS5 expression: phrases stay phrases, every other
+    word is quoted so punctuation cannot break the syntax, and a trailing * makes a prefix.
+    AND, OR and NOT are passed through as operators.
+    """
+    parts = []
+    for phrase, word in QUERY_PATTERN.findall(query):
+        if phrase:
+            parts.append('"' + phrase.replace('"', '') + '"')
+        elif word in ("AND", "OR", "NOT"):
+            parts.append(word)
+        elif word.rstrip("*"):
+            prefix = word.endswith("*")
+            parts.append('"' + word.rstrip("*").replace('"', '') + '"' + ("*" if prefix else ""))
+    if not parts:
+        raise ValueError("Enter a word, prefix* or \"phrase\" to search for")
+    return " ".join(parts)
+
+
+class EnglishIndex:
+    """
+    Read-only access to the FTS5 index. Each thread gets its own connection, so
+    searches from the UI and from worker threads can run concurrently.
+    """
+
+    def __init__(self, db_file=ENGLISH_INDEX_FILE):
+        self.db_file = db_file
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_file}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def search(self, query, translations=ENGLISH_TRANSLATIONS):
+        """
+        Yield matches, best first, as dicts with translation, reference (book, chapter, verse),
+        text and a snippet with the matching words in <b> tags.
+        """
+        placeholders = ", ".join("?" for _ in translations)
+        try:
+            cursor = self._connection().execute(
+                "SELECT translation, book_num, chapter, verse, text,"
+                " snippet(verses, 0, '<b>', '</b>', '...', 24)"
+                f" FROM verses WHERE verses MATCH ? AND translation IN ({placeholders})"
+                " ORDER BY rank",
+                (fts_query(query), *translations))
+        except sqlite3.OperationalError as e:
+            raise ValueError(f"Invalid search: {e}") from e
+        for translation, book_num, chapter, verse, text, snippet in cursor:
+            yield {
+                'translation': translation,
+                'reference': (NUMBER_TO_DATA[book_num][0], chapter, verse),
+                'text': text,
+                'snippet': snippet,
+            }
+
+
+def index_is_current(db_file=ENGLISH_INDEX_FILE):
+    if not os.path.exists(db_file):
+        return False
+    try:
+        conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        return False
+    return row is not None and row[0] == source_signature()
+
+
+_english_index = None
+_english_index_lock = threading.Lock()
+
+
+def load_english_index():
+    """Return the shared index, (re)building the file first if it is missing or stale."""
+    global _english_index
+    with _english_index_lock:
+        if _english_index is None:
+            if not index_is_current():
+                build_english_index()
+            _english_index = EnglishIndex()
+        return _english_index
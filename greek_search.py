@@ -0,0 +1,96 @@
+"""
+Search the Greek NT by inflected form, ignoring accents, breathings and case.
+"""
+
+import bisect
+import threading
+
+import numpy as np
+
+from corpus import load_corpus
+from data_structures import decode_morphology, fold_greek
+
+
+class SurfaceFormIndex:
+    """
+    Index of the corpus words keyed by their fold_greek form.
+    keys is the sorted list of distinct folded forms; the tokens of keys[i] are
+    positions[offsets[i]:offsets[i + 1]], in canonical order. Because the keys are sorted,
+    every form sharing a prefix is one contiguous run of positions found by two bisects.
+    """
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+        folded_forms = {}
+        token_keys = []
+        for i in range(len(corpus)):
+            word = corpus.word(i)
+            folded = folded_forms.get(word)
+            if folded is None:
+                folded = folded_forms[word] = fold_greek(word)
+            token_keys.append(folded)
+        self.keys = sorted(set(token_keys))
+        key_index = {key: i for i, key in enumerate(self.keys)}
+        key_ids = np.array([key_index[key] for key in token_keys], dtype=np.int32)
+        self.positions = np.argsort(key_ids, kind='stable').astype(np.int32)
+        counts = np.bincount(key_ids, minlength=len(self.keys))
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+
+    def match(self, query, prefix=False):
+        """Token positions whose folded form equals (or, with prefix, starts with) the folded query."""
+        folded = fold_greek(query)
+        if not folded:
+            return self.positions[:0]
+        start = bisect.bisect_left(self.keys, folded)
+        if prefix:
+            # Every key starting with folded sorts before folded + the highest code point
+            end = bisect.bisect_left(self.keys, folded + "\U0010ffff")
+        else:
+            end = start + 1 if start < len(self.keys) and self.keys[start] == folded else start
+        return self.positions[self.offsets[start]:self.offsets[end]]
+
+    def search(self, query, prefix=False):
+        """
+        Matches grouped by (lemma, parse), most frequent first. Each group is a dict with the
+        lemma, the pos and parse codes, their decoded descriptions, the distinct surface
+        forms and the sorted token positions.
+        """
+        corpus = self.corpus
+        positions = np.sort(self.match(query, prefix))
+        if not len(positions):
+            return []
+        group_keys = corpus.lemma_id[positions].astype(np.int64) * len(corpus.parse_codes) + corpus.parse_id[positions]
+        _, inverse, counts = np.unique(group_keys, return_inverse=True, return_counts=True)
+        # Positions ordered by group, so each group's members are one slice
+        by_group = positions[np.argsort(inverse, kind='stable')]
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        groups = []
+        for group in np.argsort(-counts, kind='stable'):
+            members = by_group[bounds[group]:bounds[group + 1]]
+            first = int(members[0])
+            pos_code = corpus.pos_codes[corpus.pos_id[first]]
+            parse_code = corpus.parse_codes[corpus.parse_id[first]]
+            pos, parse = decode_morphology(pos_code, parse_code)
+            groups.append({
+                'lemma': corpus.lemma(first),
+                'pos_code': pos_code,
+                'parse_code': parse_code,
+                'pos': pos,
+                'parse': parse,
+                'forms': sorted({corpus.word(int(i)) for i in members}),
+                'positions': members,
+            })
+        return groups
+
+
+_surface_index = None
+_surface_index_lock = threading.Lock()
+
+
+def load_surface_index():
+    """Return the shared SurfaceFormIndex over the shared corpus, building it on first use."""
+    global _surface_index
+    with _surface_index_lock:
+        if _surface_index is None:
+            _surface_index = SurfaceFormIndex(load_corpus())
+        return _surface_index
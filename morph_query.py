@@ -0,0 +1,231 @@
+"""
+Grammatical search over the Greek NT.
+
+Query language:
+    query   := pattern (";" pattern)*
+    pattern := term+
+    term    := ["-"] field ":" value ("," value)*
+
+Terms in a pattern must all hold for the same word; "-" negates a term and a
+comma lists alternatives. Patterns separated by ";" must each match some word
+of the same verse. Fields:
+
+    lemma     a lemma, matched exactly or ignoring accents and breathings
+    pos       noun, verb, adjective, adverb, article, pronoun, personal, relative,
+              demonstrative, interrogative, conjunction, preposition, particle,
+              interjection, or a CCAT code such as N- or RP
+    person, tense, voice, mood, case, number, gender, degree
+              a value name such as aorist, passive, participle, genitive,
+              or the CCAT code letter
+    in        book names/abbreviations, ranges such as Rom-Phm, or groups:
+              gospels, synoptics, luke-acts, paul, catholic, johannine
+
+"in" restricts the whole query, whichever pattern it appears in. Examples:
+
+    lemma:λύω tense:aorist voice:passive mood:participle in:paul
+    mood:participle case:genitive ; pos:noun,pronoun case:genitive in:luke-acts
+
+The second is an approximation of genitive absolutes: a genitive participle
+with a genitive noun or pronoun in the same verse.
+"""
+
+import threading
+
+import numpy as np
+
+from corpus import MORPH_FIELDS, load_corpus
+from data_structures import CCAT_PARSE_FIELDS, NEW_TESTAMENT, fold_greek
+
+POS_NAMES = {
+    'noun': ['N-'],
+    'verb': ['V-'],
+    'adjective': ['A-'],
+    'adverb': ['D-'],
+    'article': ['RA'],
+    'pronoun': ['RD', 'RI', 'RP', 'RR'],
+    'personal': ['RP'],
+    'relative': ['RR'],
+    'demonstrative': ['RD'],
+    'interrogative': ['RI'],
+    'conjunction': ['C-'],
+    'preposition': ['P-'],
+    'particle': ['X-'],
+    'interjection': ['I-'],
+}
+
+BOOK_GROUPS = {
+    'gospels': [1, 2, 3, 4],
+    'synoptics': [1, 2, 3],
+    'luke-acts': [3, 5],
+    'paul': list(range(6, 19)),
+    'pauline': list(range(6, 19)),
+    'catholic': list(range(20, 27)),
+    'johannine': [4, 23, 24, 25, 27],
+}
+
+# Value names accepted for each morphology field, e.g. 'aorist' -> 'A', '1st' -> '1'
+MORPH_VALUE_NAMES = {
+    label.lower(): {value.split()[0].lower(): code for code, value in mapping.items()}
+    for label, mapping in CCAT_PARSE_FIELDS
+}
+
+
+class MorphIndex:
+    """
+    Per-token morphology bitsets over a ColumnarCorpus.
+    The boolean mask for each (field, code) is computed on first use and kept, so
+    compiled queries are a handful of vectorised ANDs and ORs.
+    """
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+        self._masks = {}
+        self._folded_lemmas = None
+        self._lock = threading.Lock()
+
+    def mask(self, field, code):
+        key = (field, code)
+        with self._lock:
+            if key not in self._masks:
+                corpus = self.corpus
+                if field == 'pos':
+                    ids = [i for i, pos in enumerate(corpus.pos_codes) if pos == code]
+                    self._masks[key] = np.isin(corpus.pos_id, ids)
+                elif field == 'book':
+                    self._masks[key] = corpus.book == code
+                else:
+                    self._masks[key] = corpus.morph[:, MORPH_FIELDS.index(field)] == ord(code)
+            return self._masks[key]
+
+    def lemma_ids(self, lemma):
+        """IDs of the lemmas equal to `lemma`, or failing that equal ignoring accents and breathings."""
+        if lemma in self.corpus.lemma_index:
+            return [self.corpus.lemma_index[lemma]]
+        with self._lock:
+            if self._folded_lemmas is None:
+                folded = {}
+                for i, name in enumerate(self.corpus.lemmas):
+                    folded.setdefault(fold_greek(name), []).append(i)
+                self._folded_lemmas = folded
+        return self._folded_lemmas.get(fold_greek(lemma), [])
+
+
+# Every book identifier from NEW_TESTAMENT, lower-cased and without spaces
+BOOK_IDENTIFIERS = {
+    str(identifier).lower().replace(" ", ""): book[0]
+    for book in NEW_TESTAMENT for identifier in book
+}
+
+
+def parse_books(value):
+    """Book numbers for a book identifier, a range such as Rom-Phm, or a group name."""
+    value = value.lower()
+    if value in BOOK_GROUPS:
+        return BOOK_GROUPS[value]
+    if value in BOOK_IDENTIFIERS:
+        return [BOOK_IDENTIFIERS[value]]
+    start, sep, end = value.partition("-")
+    if sep and start in BOOK_IDENTIFIERS and end in BOOK_IDENTIFIERS:
+        return list(range(BOOK_IDENTIFIERS[start], BOOK_IDENTIFIERS[end] + 1))
+    raise ValueError(f"Unknown book or book group: {value}")
+
+
+def _term_mask(index, field, values):
+    corpus = index.corpus
+    result = np.zeros(len(corpus), dtype=bool)
+    for value in values:
+        if field == 'lemma':
+            result |= np.isin(corpus.lemma_id, index.lemma_ids(value))
+        elif field == 'pos':
+            codes = POS_NAMES.get(value.lower(), [value.upper()])
+            for code in codes:
+                result |= index.mask('pos', code)
+        elif field in MORPH_FIELDS:
+            code = MORPH_VALUE_NAMES[field].get(value.lower())
+            if code is None:
+                if len(value) != 1:
+                    raise ValueError(f"Unknown {field} value: {value}")
+                code = value.upper()
+            result |= index.mask(field, code)
+        else:
+            raise ValueError(f"Unknown search field: {field}")
+    return result
+
+
+def compile_query(query, index):
+    """
+    Compile a query string into (pattern masks, scope mask).
+    Each pattern mask marks the tokens matching one pattern; the scope mask marks the
+    tokens inside the books the query is restricted to.
+    """
+    corpus = index.corpus
+    scope = np.ones(len(corpus), dtype=bool)
+    patterns = []
+    for pattern_text in query.split(";"):
+        terms = pattern_text.split()
+        if not terms:
+            continue
+        pattern = np.ones(len(corpus), dtype=bool)
+        has_word_terms = False
+        for term in terms:
+            negate = term.startswith("-")
+            field, sep, values = term.lstrip("-").partition(":")
+            if not sep or not values:
+                raise ValueError(f"Expected field:value, got '{term}'")
+            field = field.lower()
+            values = [v for v in values.split(",") if v]
+            if field == 'in':
+                books = [b for value in values for b in parse_books(value)]
+                in_books = np.zeros(len(corpus), dtype=bool)
+                for book_num in books:
+                    in_books |= index.mask('book', book_num)
+                scope &= ~in_books if negate else in_books
+                continue
+            mask = _term_mask(index, field, values)
+            pattern &= ~mask if negate else mask
+            has_word_terms = True
+        if has_word_terms:
+            patterns.append(pattern)
+    if not patterns:
+        raise ValueError("The query has no word terms")
+    return patterns, scope
+
+
+def search(query, index=None):
+    """
+    Run a query and yield matching verses in canonical order, one at a time, as
+    ((book, chapter, verse), [token positions matching any pattern]).
+    All filtering is vectorised up front; only the per-verse results are produced lazily.
+    """
+    index = index or load_morph_index()
+    corpus = index.corpus
+    patterns, scope = compile_query(query, index)
+    verses = None
+    matched = np.zeros(len(corpus), dtype=bool)
+    for pattern in patterns:
+        pattern &= scope
+        matched |= pattern
+        pattern_verses = np.unique(corpus.ordinal[pattern])
+        verses = pattern_verses if verses is None else np.intersect1d(verses, pattern_verses, assume_unique=True)
+    positions = np.flatnonzero(matched & np.isin(corpus.ordinal, verses))
+    if not len(positions):
+        return
+    ordinals = corpus.ordinal[positions]
+    starts = np.flatnonzero(np.r_[True, ordinals[1:] != ordinals[:-1]])
+    ends = np.r_[starts[1:], len(positions)]
+    for start, end in zip(starts, ends):
+        first = int(positions[start])
+        yield corpus.reference(first), positions[start:end].tolist()
+
+
+_morph_index = None
+_morph_index_lock = threading.Lock()
+
+
+def load_morph_index():
+    """Return the shared MorphIndex over the shared corpus."""
+    global _morph_index
+    with _morph_index_lock:
+        if _morph_index is None:
+            _morph_index = MorphIndex(load_corpus())
+        return _morph_index
@@ -0,0 +1,100 @@
+"""
+Command line tools for building and checking the derived NT data.
+
+Usage:
+    python nt_tools.py lemma-coverage
+    python nt_tools.py build-lemma-join
+    python nt_tools.py unresolved-lemmas
+    python nt_tools.py build-corpus
+    python nt_tools.py build-english-index
+    python nt_tools.py build-alignment
+"""
+
+import argparse
+import os
+import time
+
+from alignment import ALIGNMENT_FILE, build_alignment
+from corpus import CORPUS_FILE, LEMMA_JOIN_FILE, build_corpus_file, load_lemma_join, open_corpus_file
+from data_structures import load_strongs_greek, lemma_coverage
+from english_search import ENGLISH_INDEX_FILE, build_english_index
+
+STRONGS_XML = "strongsgreek.xml"
+
+
+def report_lemma_coverage(args):
+    """How many MorphGNT lemmas resolve to a Strong's entry at each lookup tier."""
+    coverage, unresolved = lemma_coverage(load_strongs_greek(STRONGS_XML))
+    total_lemmas = sum(lemmas for lemmas, _ in coverage.values())
+    total_tokens = sum(tokens for _, tokens in coverage.values())
+    for tier in ('exact', 'folded', 'movable_nu', 'doubled_letters', None):
+        lemmas, tokens = coverage.get(tier, (0, 0))
+        print(f"{tier or 'unresolved':>16}: {lemmas:5d} lemmas ({lemmas / total_lemmas:6.1%}), "
+              f"{tokens:6d} tokens ({tokens / total_tokens:6.1%})")
+    if args.verbose and unresolved:
+        print("\nUnresolved lemmas:")
+        print(" ".join(unresolved))
+
+
+def build_lemma_join_command(args):
+    """Rebuild the lemma-to-lexicon join table for every NT word token."""
+    if os.path.exists(LEMMA_JOIN_FILE):
+        os.remove(LEMMA_JOIN_FILE)
+    join = load_lemma_join(STRONGS_XML)
+    resolved = sum(1 for strongs in join.lemma_ids.values() if strongs)
+    tokens = sum(len(ids) for ids in join.token_ids.values())
+    print(f"{len(join.lemma_ids)} lemmas ({resolved} resolved) over {tokens} tokens")
+
+
+def report_unresolved_lemmas(args):
+    """List the lemmas that did not resolve to a Strong's entry, most frequent first."""
+    for lemma, count in load_lemma_join(STRONGS_XML).unresolved():
+        print(f"{count:6d}  {lemma}")
+
+
+def build_corpus_command(args):
+    """Write the memory-mappable corpus file used by load_corpus."""
+    corpus = build_corpus_file(CORPUS_FILE)
+    start = time.perf_counter()
+    mapped = open_corpus_file(CORPUS_FILE)
+    elapsed = time.perf_counter() - start
+    assert len(mapped) == len(corpus)
+    print(f"wrote {CORPUS_FILE}: {len(corpus)} tokens, {len(corpus.lemmas)} lemmas, "
+          f"{os.path.getsize(CORPUS_FILE) / 2**20:.1f} MiB; opens in {elapsed * 1000:.1f} ms")
+
+
+def build_english_index_command(args):
+    """Rebuild the ESV/KJV full-text index used by the English search."""
+    start = time.perf_counter()
+    count = build_english_index()
+    elapsed = time.perf_counter() - start
+    print(f"wrote {ENGLISH_INDEX_FILE}: {count} verses, "
+          f"{os.path.getsize(ENGLISH_INDEX_FILE) / 2**20:.1f} MiB in {elapsed:.1f} s")
+
+
+def build_alignment_command(args):
+    """Compute the Greek-English alignment candidates shown in the word helper sidebar."""
+    start = time.perf_counter()
+    arrays = build_alignment()
+    elapsed = time.perf_counter() - start
+    translations = ", ".join(name[:-len("_best")] for name in arrays if name.endswith("_best"))
+    print(f"wrote {ALIGNMENT_FILE}: {int(arrays['tokens'])} tokens aligned to {translations}, "
+          f"{os.path.getsize(ALIGNMENT_FILE) / 2**20:.1f} MiB in {elapsed:.1f} s")
+
+
+COMMANDS = {
+    "lemma-coverage": report_lemma_coverage,
+    "build-lemma-join": build_lemma_join_command,
+    "unresolved-lemmas": report_unresolved_lemmas,
+    "build-corpus": build_corpus_command,
+    "build-english-index": build_english_index_command,
+    "build-alignment": build_alignment_command,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    parser.add_argument("-v", "--verbose", action="store_true", help="list the individual items behind a report")
+    args = parser.parse_args()
+    COMMANDS[args.command](args)
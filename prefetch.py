@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+from itertools import zip_longest
+
+from data_structures import (
+    get_book_number, get_greek_text, lookup_english_verse, lookup_entry_by_unicode, navigate_verse
+)
+
+
+class VersePrefetcher:
+    """
+    Bounded cache of verse data filled on a worker thread.
+    After each navigation, call prefetch() with the current verse; the worker then
+    loads the Greek words, ESV/KJV renderings and lexicon entries for the next and
+    previous `radius` verses so that stepping through the text renders from memory.
+    User translations are not cached here: the translation repository already
+    serves them from memory and they change as the user saves.
+    """
+
+    def __init__(self, lexicon=None, radius=3, capacity=64):
+        self.lexicon = lexicon
+        self.radius = radius
+        self.capacity = capacity
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._target = None
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="verse-prefetcher", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _key(book, chapter, verse):
+        return (get_book_number(book), chapter, verse)
+
+    def get(self, book, chapter, verse):
+        """Return the cached data for a verse, or None if it has not been prefetched."""
+        key = self._key(book, chapter, verse)
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+            return data
+
+    def prefetch(self, book, chapter, verse):
+        """Ask the worker to warm the neighbours of a verse; only the latest request is kept."""
+        with self._lock:
+            self._target = (book, chapter, verse)
+        self._wakeup.set()
+
+    def neighbours(self, book, chapter, verse):
+        """The next and previous `radius` verses as given by navigate_verse, nearest first."""
+        directions = []
+        for mode in ('next_verse', 'previous_verse'):
+            refs = []
+            ref = (book, chapter, verse)
+            for _ in range(self.radius):
+                step = navigate_verse(*ref, mode)
+                if step == ref:
+                    break  # Start of Matthew or end of Revelation
+                ref = step
+                refs.append(ref)
+            directions.append(refs)
+        # Interleave so the verses either side of the current one are loaded first
+        return [ref for pair in zip_longest(*directions) for ref in pair if ref is not None]
+
+    def load(self, book, chapter, verse):
+        """Load all view data for one verse (runs on the worker thread)."""
+        greek = get_greek_text(book, chapter, verse)
+        data = {
+            'greek': greek,
+            'esv': lookup_english_verse(book, chapter, verse, "ESV"),
+            'kjv': lookup_english_verse(book, chapter, verse, "KJV"),
+            'entries': {},
+        }
+        # Never block the worker on a lexicon that is still loading, nor use one that failed to load
+        lexicon = self.lexicon
+        if (lexicon is not None and getattr(lexicon, 'is_loaded', lambda: True)()
+                and not getattr(lexicon, 'failed', lambda: False)()):
+            for word in greek:
+                data['entries'][word['lemma']] = lookup_entry_by_unicode(word['lemma'], lexicon)
+        return data
+
+    def _store(self, key, data):
+        with self._lock:
+            self._cache[key] = data
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                target = self._target
+            if target is None:
+                continue
+            try:
+                refs = [target] + self.neighbours(*target)
+            except Exception:
+                continue
+            for ref in refs:
+                if self._wakeup.is_set():
+                    break  # The user moved on; start again around the new verse
+                key = self._key(*ref)
+                with self._lock:
+                    cached = key in self._cache
+                if cached:
+                    continue
+                try:
+                    data = self.load(*ref)
+                except Exception:
+                    continue  # Leave this verse to the UI, which reports the error; keep warming the rest
+                self._store(key, data)
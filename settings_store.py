@@ -0,0 +1,53 @@
+import configparser
+import os
+
+
+class SettingsStore:
+    """
+    In-memory copy of settings.ini.
+    Changes only mark the store dirty; flush() writes them out, so callers on hot
+    paths such as verse navigation never touch the disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.config = configparser.ConfigParser()
+        self._dirty = False
+        if os.path.exists(path):
+            try:
+                self.config.read(path)
+            except configparser.Error:
+                pass  # Corrupted ini: start from defaults, it is rewritten on the next flush
+
+    def get(self, section, key, fallback=None):
+        return self.config.get(section, key, fallback=fallback)
+
+    def has(self, section, key):
+        return self.config.has_option(section, key)
+
+    def set(self, section, key, value):
+        self.update_section(section, {key: value})
+
+    def update_section(self, section, values):
+        """Set several keys of a section at once, marking the store dirty only if something changed."""
+        if not self.config.has_section(section):
+            self.config.add_section(section)
+        for key, value in values.items():
+            value = str(value)
+            if self.config.get(section, key, fallback=None) != value:
+                self.config.set(section, key, value)
+                self._dirty = True
+
+    def is_dirty(self):
+        return self._dirty
+
+    def flush(self):
+        """Write the settings to disk if they changed since the last flush."""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as configfile:
+            self.config.write(configfile)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
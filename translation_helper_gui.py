@@ -23,21 +23,127 @@ This software uses the following third-party libraries:
 
 import sys
 import os
-import configparser
+import functools
 import webbrowser
 import unicodedata
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QTextEdit, QLineEdit, QMessageBox, QStatusBar, QComboBox, QFileDialog, QAction, QMenuBar, QInputDialog
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QTextEdit, QLineEdit, QListWidgetItem, QMessageBox, QStatusBar, QComboBox, QFileDialog, QAction, QMenuBar, QInputDialog, QDialog
 )
-from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtCore import Qt, QEvent, QTimer
 from PyQt5.QtGui import QKeySequence
 from PyQt5.QtPrintSupport import QPrinter
 from PyQt5.QtGui import QTextDocument
 from data_structures import (
-    load_user_translation, save_user_translation, lookup_english_verse, get_greek_text, parse_strongs_greek, lookup_entry_by_unicode, interpret_ccat_parse, interpret_ccat_pos, navigate_verse, NEW_TESTAMENT
+    load_user_translation, save_user_translation, lookup_english_verse, get_greek_text, load_strongs_greek, LazyLexicon, BackgroundLoader, lookup_entry_by_unicode, decode_morphology, navigate_verse, NEW_TESTAMENT,
+    get_user_translations, use_user_translation_backend, verse_ordinal
 )
+from settings_store import SettingsStore
+from prefetch import VersePrefetcher
+from corpus import load_corpus_file, load_lemma_join
+from concordance import load_concordance
+from morph_query import load_morph_index, search as morph_search
+from translation_search import load_translation_index
+from english_search import load_english_index
+from greek_search import load_surface_index
+from alignment import ALIGNMENT_TRANSLATIONS, load_alignment
+from user_glosses import load_user_glosses
 import tempfile
 
+
+class SearchResultsDialog(QDialog):
+    """
+    A query box and result list that fills incrementally.
+    run_query(text) returns an iterator of (reference, label, tooltip); results are
+    drawn from it a chunk at a time on a timer so long result sets never block the UI.
+    Double-clicking a result calls open_reference(reference). If the search needs a
+    BackgroundLoader, it is started with the dialog and searches wait for it on the timer.
+    """
+
+    def __init__(self, parent, title, run_query, open_reference, placeholder="", chunk_size=50, loader=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.resize(700, 500)
+        self.run_query = run_query
+        self.open_reference = open_reference
+        self.chunk_size = chunk_size
+        self._results = None
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText(placeholder)
+        self.query_input.returnPressed.connect(self.start_search)
+        search_button = QPushButton("Search")
+        search_button.clicked.connect(self.start_search)
+        query_layout = QHBoxLayout()
+        query_layout.addWidget(self.query_input)
+        query_layout.addWidget(search_button)
+        self.result_list = QListWidget()
+        self.result_list.itemDoubleClicked.connect(self.open_item)
+        self.result_list.currentItemChanged.connect(self.show_preview)
+        self.result_label = QLabel("")
+        # Shows the selected result's tooltip, which may be rich text
+        self.preview = QTextEdit()
+        self.preview.setReadOnly(True)
+        self.preview.setMaximumHeight(160)
+        layout = QVBoxLayout()
+        layout.addLayout(query_layout)
+        layout.addWidget(self.result_list)
+        layout.addWidget(self.preview)
+        layout.addWidget(self.result_label)
+        self.setLayout(layout)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.add_results)
+        self.loader = loader
+        if loader is not None:
+            loader.start()
+
+    def start_search(self):
+        self._timer.stop()
+        self.result_list.clear()
+        self.preview.clear()
+        try:
+            self._results = iter(self.run_query(self.query_input.text().strip()))
+        except ValueError as e:
+            self._results = None
+            self.result_label.setText(str(e))
+            return
+        self.result_label.setText("Searching...")
+        self._timer.start(0)
+
+    def add_results(self):
+        if self.loader is not None and not self.loader.is_loaded():
+            self.result_label.setText("Loading the search index...")
+            self._timer.setInterval(100)
+            return
+        self._timer.setInterval(0)
+        for _ in range(self.chunk_size):
+            try:
+                reference, label, tooltip = next(self._results)
+            except StopIteration:
+                self._timer.stop()
+                count = self.result_list.count()
+                self.result_label.setText(f"{count} result{'s' if count != 1 else ''}")
+                return
+            except Exception as e:
+                # Bad queries raise ValueError; anything else is a failed index load
+                self._timer.stop()
+                self.result_label.setText(str(e))
+                return
+            item = QListWidgetItem(label)
+            item.setToolTip(tooltip)
+            item.setData(Qt.UserRole, reference)
+            self.result_list.addItem(item)
+        self.result_label.setText(f"{self.result_list.count()} results so far...")
+
+    def show_preview(self, item, previous=None):
+        self.preview.setHtml(item.toolTip() if item else "")
+
+    def open_item(self, item):
+        self.open_reference(item.data(Qt.UserRole))
+
+    def closeEvent(self, event):
+        self._timer.stop()
+        super().closeEvent(event)
+
+
 class TranslationHelperGUI(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -48,8 +154,36 @@ class TranslationHelperGUI(QMainWindow):
         self.current_verse = 1
         self.translation_changed = False
         self.translation_name = "ESV"
-        self.strongs_dict = parse_strongs_greek("strongsgreek.xml")
+        # Loaded on a worker thread once the window is shown; see start_background_loading
+        self.strongs_dict = LazyLexicon(load_strongs_greek, "strongsgreek.xml")
+        # Strong's number of every NT word token, loaded in the background when the corpus file lacks current ones
+        # Resolved against strongs_dict rather than a second parse of the same XML
+        self.lemma_join = BackgroundLoader(functools.partial(load_lemma_join, lexicon=self.strongs_dict))
+        # The indexes below are loaded in the background when their pane or dialog is first used
+        # Lemma concordance over the whole NT
+        self.concordance = BackgroundLoader(load_concordance)
+        # Per-token morphology bitsets for grammatical search
+        self.morph_index = BackgroundLoader(load_morph_index)
+        # Inverted index over the user's translations, kept current on every save
+        self.translation_index = BackgroundLoader(load_translation_index)
+        # FTS5 index over the ESV and KJV New Testament, built on first use
+        self.english_index = BackgroundLoader(load_english_index)
+        # Accent-insensitive index of the Greek inflected forms
+        self.surface_index = BackgroundLoader(load_surface_index)
+        # Precomputed Greek-English alignment (None until nt_tools.py build-alignment has run)
+        self.alignment = BackgroundLoader(load_alignment)
+        self._selected_word = None
+        # How the user has translated each lemma before, kept current on every save
+        self.user_glosses = BackgroundLoader(load_user_glosses)
+        # Warms neighbouring verses in the background after every navigation
+        self.prefetcher = VersePrefetcher(self.strongs_dict)
         self.config_path = os.path.join("userdata", "settings.ini")
+        self.settings = SettingsStore(self.config_path)
+        # Settings changes are kept in memory and written out periodically and on close
+        self._settings_timer = QTimer(self)
+        self._settings_timer.timeout.connect(self.settings.flush)
+        self._settings_timer.start(5000)
+        self.init_translation_storage()
         self.load_last_verse()
         self.sidebar_visible = False  # Track sidebar visibility
         self.init_ui()
@@ -57,25 +191,27 @@ class TranslationHelperGUI(QMainWindow):
         self.user_name = self.load_user_name()
         self.init_menu_bar()
 
+    def init_translation_storage(self):
+        # [storage] backend = json (default) or sqlite in settings.ini
+        # An unknown value falls back to json; the warning is shown once the status bar is free
+        self.storage_warning = None
+        backend = self.settings.get('storage', 'backend', fallback='json')
+        try:
+            use_user_translation_backend(backend)
+        except ValueError:
+            use_user_translation_backend('json')
+            self.storage_warning = f"Unknown storage backend '{backend}' in settings.ini; using json."
+
     def load_user_name(self):
         # Store user's name in settings.ini and prompt only if not present
-        config = configparser.ConfigParser()
-        if os.path.exists(self.config_path):
-            config.read(self.config_path)
-            if 'user' in config and 'name' in config['user']:
-                return config['user']['name']
+        if self.settings.has('user', 'name'):
+            return self.settings.get('user', 'name')
         # Prompt for name if not set
         name, ok = QInputDialog.getText(self, "User Name", "Enter your name for export titles:")
         if ok and name.strip():
             # Save to settings file for future use
-            if os.path.exists(self.config_path):
-                config.read(self.config_path)
-            if 'user' not in config:
-                config['user'] = {}
-            config['user']['name'] = name.strip()
-            os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-            with open(self.config_path, 'w') as configfile:
-                config.write(configfile)
+            self.settings.set('user', 'name', name.strip())
+            self.settings.flush()
             return name.strip()
         return "User"
 
@@ -91,8 +227,114 @@ class TranslationHelperGUI(QMainWindow):
         export_menu.addAction(export_html_action)
         export_menu.addAction(export_pdf_action)
         export_menu.addAction(export_all_html_action)
+        search_menu = menubar.addMenu("Search")
+        grammar_search_action = QAction("Grammar Search...", self)
+        grammar_search_action.triggered.connect(self.open_grammar_search)
+        search_menu.addAction(grammar_search_action)
+        translation_search_action = QAction("Search My Translations...", self)
+        translation_search_action.setShortcut(QKeySequence("Ctrl+Shift+F"))
+        translation_search_action.triggered.connect(self.open_translation_search)
+        search_menu.addAction(translation_search_action)
+        english_search_action = QAction("Search ESV/KJV...", self)
+        english_search_action.triggered.connect(self.open_english_search)
+        search_menu.addAction(english_search_action)
+        greek_search_action = QAction("Search Greek Forms...", self)
+        greek_search_action.triggered.connect(self.open_greek_search)
+        search_menu.addAction(greek_search_action)
         self.setMenuBar(menubar)
 
+    def open_grammar_search(self):
+        if not hasattr(self, 'grammar_search_dialog'):
+            self.grammar_search_dialog = SearchResultsDialog(
+                self, "Grammar Search", self.run_grammar_query, self.open_reference,
+                placeholder="e.g. lemma:λύω tense:aorist voice:passive mood:participle in:paul",
+                loader=self.morph_index)
+        self.grammar_search_dialog.show()
+        self.grammar_search_dialog.raise_()
+
+    def open_translation_search(self):
+        if not hasattr(self, 'translation_search_dialog'):
+            self.translation_search_dialog = SearchResultsDialog(
+                self, "Search My Translations", self.run_translation_query, self.jump_to_search_hit,
+                placeholder='Words, prefix* or "a phrase"', loader=self.translation_index)
+        self.translation_search_dialog.show()
+        self.translation_search_dialog.raise_()
+
+    def run_translation_query(self, query):
+        store = get_user_translations()
+        for book, chapter, verse in self.translation_index.wait().search(query):
+            text = store.get(book, chapter, verse) or ""
+            snippet = text if len(text) <= 80 else text[:77] + "..."
+            yield (book, chapter, verse), f"{book} {chapter}:{verse}  {snippet}", text
+
+    def open_english_search(self):
+        if not hasattr(self, 'english_search_dialog'):
+            self.english_search_dialog = SearchResultsDialog(
+                self, "Search ESV/KJV", self.run_english_query, self.jump_to_search_hit,
+                placeholder='e.g. propitiation, "the word was", reconcil*', loader=self.english_index)
+        self.english_search_dialog.show()
+        self.english_search_dialog.raise_()
+
+    def run_english_query(self, query):
+        for match in self.english_index.wait().search(query):
+            book, chapter, verse = match['reference']
+            greek = " ".join(word['text'] for word in get_greek_text(book, chapter, verse))
+            side_by_side = (
+                f"<h3>{book} {chapter}:{verse}</h3><table width='100%'><tr>"
+                f"<td width='50%' style='font-size:16px'>{greek}</td>"
+                f"<td width='50%' style='font-size:16px'><b>{match['translation']}:</b> {match['snippet']}</td>"
+                f"</tr></table>")
+            label = f"{match['translation']}  {book} {chapter}:{verse}  {match['text']}"
+            yield match['reference'], label, side_by_side
+
+    def open_greek_search(self):
+        if not hasattr(self, 'greek_search_dialog'):
+            self.greek_search_dialog = SearchResultsDialog(
+                self, "Search Greek Forms", self.run_greek_query, self.open_reference,
+                placeholder="An inflected form without accents, e.g. λογον, or a prefix such as ελαβ*",
+                loader=self.surface_index)
+        self.greek_search_dialog.show()
+        self.greek_search_dialog.raise_()
+
+    def run_greek_query(self, query):
+        prefix = query.endswith("*")
+        index = self.surface_index.wait()
+        corpus = index.corpus
+        groups = index.search(query.rstrip("*"), prefix=prefix)
+        if not groups and not query.rstrip("*").strip():
+            raise ValueError("Enter a Greek form to search for")
+        for group in groups:
+            positions = group['positions']
+            heading = f"{', '.join(group['forms'])} — {group['lemma']}, {group['pos']}, {group['parse']} ({len(positions)})"
+            first = corpus.reference(int(positions[0]))
+            yield first, heading, f"<b>{heading}</b>"
+            for position in positions:
+                position = int(position)
+                book, chapter, verse = corpus.reference(position)
+                verse_slice = corpus.verse_slice(book, chapter, verse)
+                words = [corpus.text(i) for i in range(verse_slice.start, verse_slice.stop)]
+                words[position - verse_slice.start] = f"<b>{words[position - verse_slice.start]}</b>"
+                yield (book, chapter, verse), f"    {book} {chapter}:{verse}  {corpus.word(position)}", " ".join(words)
+
+    def jump_to_search_hit(self, reference):
+        if not reference or not self.maybe_save_translation():
+            return
+        book, chapter, verse = reference
+        self.book_input.setCurrentIndex(self.book_input.findText(book))
+        self.chapter_input.setText(str(chapter))
+        self.verse_input.setText(str(verse))
+        self.jump_to_reference()
+
+    def run_grammar_query(self, query):
+        index = self.morph_index.wait()
+        corpus = index.corpus
+        for reference, positions in morph_search(query, index):
+            book, chapter, verse = reference
+            words = " ".join(corpus.text(i) for i in positions)
+            verse_slice = corpus.verse_slice(book, chapter, verse)
+            context = " ".join(corpus.text(i) for i in range(verse_slice.start, verse_slice.stop))
+            yield reference, f"{book} {chapter}:{verse}  {words}", context
+
     def export_range_html(self):
         # Prompt for range (start/end chapter/verse, same book)
         book = self.current_book
@@ -117,12 +359,7 @@ class TranslationHelperGUI(QMainWindow):
 
     def get_pdf_stylesheet(self):
         # Try to get font size from settings.ini, default to 12pt
-        font_size = "12pt"
-        config = configparser.ConfigParser()
-        if os.path.exists(self.config_path):
-            config.read(self.config_path)
-            if 'pdf' in config and 'font_size' in config['pdf']:
-                font_size = config['pdf']['font_size']
+        font_size = self.settings.get('pdf', 'font_size', fallback="12pt")
 
         return f'''
         body {{ font-family: Arial, Helvetica, sans-serif; font-size: {font_size}; }}
@@ -160,21 +397,18 @@ class TranslationHelperGUI(QMainWindow):
 
     def export_all_html(self):
         # Export all user translations to HTML with improved formatting
-        from data_structures import load_user_translations
-        translations = load_user_translations()
         html = f"<h1>{self.user_name}'s New Testament Translations</h1>"
-        for book in translations:
-            html += f"<h2>{book}</h2>"
-            for chapter in sorted(translations[book], key=lambda x: int(x)):
+        current_book = current_chapter = None
+        for book, chapter, verse, text in get_user_translations().iter_all():
+            if book != current_book:
+                html += f"<h2>{book}</h2>"
+                current_book, current_chapter = book, None
+            if chapter != current_chapter:
                 html += f"<h3>Chapter {chapter}</h3>"
-                first_verse = True
-                for verse in sorted(translations[book][chapter], key=lambda x: int(x)):
-                    text = translations[book][chapter][verse]
-                    if first_verse:
-                        html += f"<b>{book} {chapter}:{verse}</b>: {text}<br>"
-                        first_verse = False
-                    else:
-                        html += f"<b>{verse}:</b> {text}<br>"
+                current_chapter = chapter
+                html += f"<b>{book} {chapter}:{verse}</b>: {text}<br>"
+            else:
+                html += f"<b>{verse}:</b> {text}<br>"
         filename = f"{self.user_name}_all_translations.html"
         filepath = os.path.join("userdata", filename)
         with open(filepath, "w", encoding="utf-8") as f:
@@ -182,34 +416,18 @@ class TranslationHelperGUI(QMainWindow):
         self.open_with_system_app(filepath)
 
     def build_range_html(self, book, start_chapter, start_verse, end_chapter, end_verse):
-        # Build HTML for a range of verses in one book using only the user's translation file, with improved formatting
-        from data_structures import load_user_translations
+        # Build HTML for a range of verses in one book using only the user's translations, with improved formatting
         html = f"<h1>{self.user_name}'s translation of {book} {start_chapter}:{start_verse}-{end_chapter}:{end_verse}</h1>"
-        translations = load_user_translations()
-        if book not in translations:
-            return html + "<br><i>(no translations for this book)</i>"
-        def in_range(ch, vs):
-            if (ch < start_chapter) or (ch > end_chapter):
-                return False
-            if ch == start_chapter and vs < start_verse:
-                return False
-            if ch == end_chapter and vs > end_verse:
-                return False
-            return True
-        for ch_str in sorted(translations[book], key=lambda x: int(x)):
-            ch = int(ch_str)
-            verses_in_chapter = [int(vs) for vs in translations[book][ch_str].keys() if in_range(ch, int(vs))]
-            if not verses_in_chapter:
-                continue
-            html += f"<h2>Chapter {ch}</h2>"
-            first_verse = True
-            for vs in sorted(verses_in_chapter):
-                user_text = translations[book][ch_str][str(vs)]
-                if first_verse:
-                    html += f"<b>{book} {ch}:{vs}</b>: {user_text}<br>"
-                    first_verse = False
-                else:
-                    html += f"<b>{vs}:</b> {user_text}<br>"
+        current_chapter = None
+        for _, ch, vs, user_text in get_user_translations().iter_range(book, start_chapter, start_verse, end_chapter, end_verse):
+            if ch != current_chapter:
+                html += f"<h2>Chapter {ch}</h2>"
+                current_chapter = ch
+                html += f"<b>{book} {ch}:{vs}</b>: {user_text}<br>"
+            else:
+                html += f"<b>{vs}:</b> {user_text}<br>"
+        if current_chapter is None:
+            return html + "<br><i>(no translations in this range)</i>"
         return html
 
     def open_with_system_app(self, filepath):
@@ -220,51 +438,21 @@ class TranslationHelperGUI(QMainWindow):
         else:
             os.system(f'xdg-open "{filepath}"')
 
-    def load_last_verse(self):
-        config = configparser.ConfigParser()
-        fallback = ("Matthew", 1, 1)
-        if os.path.exists(self.config_path):
-            try:
-                config.read(self.config_path)
-                if 'last_verse' in config:
-                    book = config['last_verse'].get('book', fallback[0])
-                    chapter = int(config['last_verse'].get('chapter', fallback[1]))
-                    verse = int(config['last_verse'].get('verse', fallback[2]))
-                    # Check if this reference exists
-                    greek_text_data = get_greek_text(book, chapter, verse)
-                    if greek_text_data:
-                        self.current_book = book
-                        self.current_chapter = chapter
-                        self.current_verse = verse
-                        return
-            except Exception:
-                pass  # If ini is corrupted or reference is invalid, fall back
-        # Fallback to Matthew 1:1
-        self.current_book, self.current_chapter, self.current_verse = fallback
-
     def save_last_verse(self):
-        # Only save if the current reference is valid
-        greek_text_data = get_greek_text(self.current_book, self.current_chapter, self.current_verse)
-        if not greek_text_data:
+        # Only save if the current reference is valid; this just updates the in-memory settings
+        if verse_ordinal(self.current_book, self.current_chapter, self.current_verse) is None:
             return  # Don't save invalid reference
-        config = configparser.ConfigParser()
-        # Read existing config to preserve user name and other settings
-        if os.path.exists(self.config_path):
-            config.read(self.config_path)
-        config['last_verse'] = {
+        self.settings.update_section('last_verse', {
             'book': self.current_book,
-            'chapter': str(self.current_chapter),
-            'verse': str(self.current_verse)
-        }
-        config['window'] = {
-            'x': str(self.x()),
-            'y': str(self.y()),
-            'width': str(self.width()),
-            'height': str(self.height())
-        }
-        os.makedirs(os.path.dirname(self.config_path), exist_ok=True)
-        with open(self.config_path, 'w') as configfile:
-            config.write(configfile)
+            'chapter': self.current_chapter,
+            'verse': self.current_verse
+        })
+        self.settings.update_section('window', {
+            'x': self.x(),
+            'y': self.y(),
+            'width': self.width(),
+            'height': self.height()
+        })
 
     def init_ui(self):
         main_widget = QWidget()
@@ -363,6 +551,17 @@ class TranslationHelperGUI(QMainWindow):
         self.wiktionary_button = QPushButton("Wiktionary")
         self.wiktionary_button.setStyleSheet("font-size: 22px;")
         self.wiktionary_button.clicked.connect(self.open_wiktionary)
+        # --- Concordance of the selected word's lemma ---
+        self.concordance_label = QLabel("Occurrences of this lemma:")
+        self.concordance_list = QListWidget()
+        self.concordance_list.setToolTip("Every occurrence of the selected word's lemma; double-click to go there")
+        self.concordance_list.itemActivated.connect(self.open_concordance_item)
+        self.concordance_more_button = QPushButton("More occurrences")
+        self.concordance_more_button.clicked.connect(self.show_more_concordance)
+        self._concordance_lemma = None
+        self._concordance_page = 0
+        self._concordance_timer = QTimer(self)
+        self._concordance_timer.timeout.connect(self.refresh_concordance)
         # --- Add sidebar to main layout ---
         main_layout.addLayout(left_layout, 3)
         main_layout.addWidget(self.sidebar_widget, 2)
@@ -377,6 +576,26 @@ class TranslationHelperGUI(QMainWindow):
     def show_status(self, message, timeout=2000):
         self.status_bar.showMessage(message, timeout)
 
+    def start_background_loading(self):
+        # Load the Strong's dictionary off the UI thread and report progress in the status bar
+        self.strongs_dict.start()
+        corpus = load_corpus_file()
+        if corpus is None or corpus.lemma_strongs is None:
+            self.lemma_join.start()
+        self._lexicon_timer = QTimer(self)
+        self._lexicon_timer.timeout.connect(self.update_lexicon_progress)
+        self._lexicon_timer.start(100)
+
+    def update_lexicon_progress(self):
+        if self.strongs_dict.is_loaded():
+            self._lexicon_timer.stop()
+            if self.storage_warning:
+                self.show_status(self.storage_warning, 10000)
+            else:
+                self.show_status("Strong's dictionary loaded.")
+        else:
+            self.show_status(f"Loading Strong's dictionary... {int(self.strongs_dict.progress * 100)}%", 0)
+
     def toggle_sidebar(self):
         self.sidebar_visible = not self.sidebar_visible
         if self.sidebar_visible:
@@ -394,7 +613,11 @@ class TranslationHelperGUI(QMainWindow):
 
     def update_verse(self):
         self.save_last_verse()
-        greek_text_data = get_greek_text(self.current_book, self.current_chapter, self.current_verse)
+        self._verse_data = self.prefetcher.get(self.current_book, self.current_chapter, self.current_verse)
+        if self._verse_data is not None:
+            greek_text_data = self._verse_data['greek']
+        else:
+            greek_text_data = get_greek_text(self.current_book, self.current_chapter, self.current_verse)
         greek_text = " ".join([word['text'] for word in greek_text_data])
         # Update the jump controls to reflect the current verse
         idx = self.book_input.findText(self.current_book)
@@ -416,6 +639,12 @@ class TranslationHelperGUI(QMainWindow):
         for word in greek_text_data:
             self.word_list.addItem(word['word'])
         self.lookup_info.clear()
+        self.concordance_list.clear()
+        self.concordance_label.setText("Occurrences of this lemma:")
+        self.concordance_more_button.setEnabled(False)
+        self._concordance_lemma = None
+        self._concordance_page = 0
+        self._selected_word = None
         self.translation_input.setFocus()
         self.show_status(f"Viewing {self.current_book} {self.current_chapter}:{self.current_verse}")
         # Tooltips
@@ -430,6 +659,7 @@ class TranslationHelperGUI(QMainWindow):
         self.word_list.setToolTip("Select a Greek word to see lexical and parsing info")
         self.lookup_info.setToolTip("Lexical and parsing info for the selected word")
         # Do NOT auto-select the first word in the word list
+        self.prefetcher.prefetch(self.current_book, self.current_chapter, self.current_verse)
 
     def show_standard_sidebar(self):
         if self.compare_button.text() == "Hide Standard Translations":
@@ -444,8 +674,14 @@ class TranslationHelperGUI(QMainWindow):
             if widget is not None:
                 widget.setParent(None)
         self.standard_text.setText("")
-        esv_translation = lookup_english_verse(self.current_book, self.current_chapter, self.current_verse, "ESV")
-        kjv_translation = lookup_english_verse(self.current_book, self.current_chapter, self.current_verse, "KJV")
+        if self._verse_data is not None:
+            esv_translation = self._verse_data['esv']
+            kjv_translation = self._verse_data['kjv']
+        else:
+            esv_translation = lookup_english_verse(self.current_book, self.current_chapter, self.current_verse, "ESV")
+            kjv_translation = lookup_english_verse(self.current_book, self.current_chapter, self.current_verse, "KJV")
+        esv_translation = self.highlight_gloss("ESV", esv_translation)
+        kjv_translation = self.highlight_gloss("KJV", kjv_translation)
         self.standard_text.setText(f"<b>ESV:</b> {esv_translation}<br><br><b>KJV:</b> {kjv_translation}")
         self.sidebar_layout.addWidget(self.standard_text)
         # Always keep sidebar_widget visible
@@ -459,6 +695,10 @@ class TranslationHelperGUI(QMainWindow):
             return
         self.lookup_button.setText("Hide Word Helpers")
         self.compare_button.setText("Show Standard Translations")
+        # Load the word helper indexes the first time the pane is opened
+        self.concordance.start()
+        self.user_glosses.start()
+        self.alignment.start()
         # Clear sidebar and add lookup widgets
         while self.sidebar_layout.count():
             item = self.sidebar_layout.takeAt(0)
@@ -469,6 +709,9 @@ class TranslationHelperGUI(QMainWindow):
         self.sidebar_layout.addWidget(self.word_list)
         self.sidebar_layout.addWidget(self.lookup_info)
         self.sidebar_layout.addWidget(self.wiktionary_button)
+        self.sidebar_layout.addWidget(self.concordance_label)
+        self.sidebar_layout.addWidget(self.concordance_list)
+        self.sidebar_layout.addWidget(self.concordance_more_button)
         # Always keep sidebar_widget visible
         self.sidebar_widget.setVisible(True)
         self.compare_button.setEnabled(True)
@@ -489,31 +732,29 @@ class TranslationHelperGUI(QMainWindow):
 
 
     def load_last_verse(self):
-        config = configparser.ConfigParser()
         fallback = ("Matthew", 1, 1)
-        if os.path.exists(self.config_path):
-            try:
-                config.read(self.config_path)
-                if 'last_verse' in config:
-                    book = config['last_verse'].get('book', fallback[0])
-                    chapter = int(config['last_verse'].get('chapter', fallback[1]))
-                    verse = int(config['last_verse'].get('verse', fallback[2]))
-                    greek_text_data = get_greek_text(book, chapter, verse)
-                    if greek_text_data:
-                        self.current_book = book
-                        self.current_chapter = chapter
-                        self.current_verse = verse
-                if 'window' in config:
-                    x = int(config['window'].get('x', '100'))
-                    y = int(config['window'].get('y', '100'))
-                    width = int(config['window'].get('width', '1300'))
-                    height = int(config['window'].get('height', '800'))
-                    self.setGeometry(x, y, width, height)
-                    self.resize(width, height)
-                    self.move(x, y)
-                    return
-            except Exception:
-                pass
+        self.current_book, self.current_chapter, self.current_verse = fallback
+        try:
+            if self.settings.config.has_section('last_verse'):
+                book = self.settings.get('last_verse', 'book', fallback[0])
+                chapter = int(self.settings.get('last_verse', 'chapter', fallback[1]))
+                verse = int(self.settings.get('last_verse', 'verse', fallback[2]))
+                # Same check as save_last_verse, so verses the SBLGNT omits are restored too
+                if verse_ordinal(book, chapter, verse) is not None:
+                    self.current_book = book
+                    self.current_chapter = chapter
+                    self.current_verse = verse
+            if self.settings.config.has_section('window'):
+                x = int(self.settings.get('window', 'x', '100'))
+                y = int(self.settings.get('window', 'y', '100'))
+                width = int(self.settings.get('window', 'width', '1300'))
+                height = int(self.settings.get('window', 'height', '800'))
+                self.setGeometry(x, y, width, height)
+                self.resize(width, height)
+                self.move(x, y)
+                return
+        except Exception:
+            pass
         self.current_book, self.current_chapter, self.current_verse = fallback
         self.setGeometry(100, 100, 1300, 800)
         self.resize(1300, 800)
@@ -545,6 +786,8 @@ class TranslationHelperGUI(QMainWindow):
         if not self.maybe_save_translation():
             event.ignore()
         else:
+            self.save_last_verse()
+            self.settings.flush()
             event.accept()
 
     def next_verse(self):
@@ -593,29 +836,160 @@ class TranslationHelperGUI(QMainWindow):
         self.current_verse = verse
         self.update_verse()
 
+    def wait_for(self, loader):
+        # Block until a background load finishes; report a failed load instead of raising into Qt
+        try:
+            return loader.wait()
+        except Exception as error:
+            self.show_status(f"Loading failed: {error}", 10000)
+            return None
+
+    def loaded_data(self, loader):
+        # The result of a background load if it has finished successfully, otherwise None
+        return self.wait_for(loader) if loader.is_loaded() else None
+
     def display_word_info(self, idx):
         if idx < 0 or idx >= len(self._sidebar_lemmas):
             self.lookup_info.clear()
             return
         lemma = self._sidebar_lemmas[idx]
-        pos = interpret_ccat_pos(self._sidebar_pos[idx])
-        parse = interpret_ccat_parse(self._sidebar_parse[idx])
+        pos, parse = decode_morphology(self._sidebar_pos[idx], self._sidebar_parse[idx])
         info = f"<div style='font-size:17px'><h2>{self.word_list.item(idx).text()}</h2><b>Part of Speech:</b> {pos}"
         info += f"<br><b>Parsing:</b> {parse}"
-        entry = lookup_entry_by_unicode(lemma, self.strongs_dict)
+        strongs = 0
+        # The mapped corpus file carries the Strong's numbers unless the lexicon changed since it was built
+        corpus = load_corpus_file()
+        join = corpus if corpus is not None and corpus.lemma_strongs is not None else self.loaded_data(self.lemma_join)
+        if join is not None and self.strongs_dict.is_loaded():
+            entry_ids = join.verse_entry_ids(self.current_book, self.current_chapter, self.current_verse)
+            strongs = entry_ids[idx] if idx < len(entry_ids) else 0
+        lexicon = self.loaded_data(self.strongs_dict)
+        if strongs and lexicon is not None:
+            entry = lexicon.get_by_number(strongs)
+        elif self._verse_data is not None and lemma in self._verse_data['entries']:
+            entry = self._verse_data['entries'][lemma]
+        else:
+            if not self.strongs_dict.is_loaded():
+                self.show_status("Waiting for Strong's dictionary to finish loading...", 0)
+                self.status_bar.repaint()
+            lexicon = self.wait_for(self.strongs_dict)
+            entry = lookup_entry_by_unicode(lemma, lexicon) if lexicon is not None else None
         if entry:
-            definition = entry.get('definition', '')
-            pronunciation = entry.get('pronunciation', '')
-            transliteration = entry.get('transliteration', '')
-            info += f"<br><br><b>Dictionary form:</b> {lemma}<br><b>Definition:</b> {definition}"
-            if transliteration:
-                info += f"<br><b>Transliteration:</b> {transliteration}"
-            if pronunciation:
-                info += f"<br><b>Pronunciation:</b> {pronunciation}"
+            info += f"<br><br><b>Dictionary form:</b> {lemma} (Strong's G{entry.strongs})<br><b>Definition:</b> {entry.definition or ''}"
+            if entry.transliteration:
+                info += f"<br><b>Transliteration:</b> {entry.transliteration}"
+            if entry.pronunciation:
+                info += f"<br><b>Pronunciation:</b> {entry.pronunciation}"
+            if entry.derivation:
+                info += f"<br><b>Derivation:</b> {entry.derivation}"
+            if entry.kjv_def:
+                info += f"<br><b>KJV usage:</b> {entry.kjv_def}"
+            lexicon = self.loaded_data(self.strongs_dict)
+            chain = lexicon.derivation_chain(entry.strongs) if lexicon is not None else []
+            if len(chain) > 1:
+                info += "<br><b>Derivation chain:</b> " + " ← ".join(f"{e.unicode} (G{e.strongs})" for e in chain)
+            derived = lexicon.derived_words(entry.strongs, max_depth=1) if lexicon is not None else []
+            if derived:
+                shown = ", ".join(e.unicode for e, _ in derived[:12])
+                more = f" and {len(derived) - 12} more" if len(derived) > 12 else ""
+                info += f"<br><b>Words derived from this:</b> {shown}{more}"
             info += "</div>"
         else:
             info = f"<div style='font-size:17px'>No entry found for lemma: {lemma}</div>"
+        self._selected_word = idx
+        info += self.user_gloss_info(lemma)
+        info += self.alignment_info(lemma)
         self.lookup_info.setHtml(info)
+        self.show_concordance(lemma)
+
+    def gloss_span(self, translation, text):
+        # Span of the English word aligned to the selected Greek word, if the alignment is available
+        alignment = self.loaded_data(self.alignment)
+        if self._selected_word is None or alignment is None:
+            return None
+        position = alignment.token_position(self.current_book, self.current_chapter, self.current_verse, self._selected_word)
+        return alignment.gloss_span(translation, position, text)
+
+    def highlight_gloss(self, translation, text):
+        span = self.gloss_span(translation, text)
+        if span is None:
+            return text
+        start, end = span
+        return f"{text[:start]}<b><u>{text[start:end]}</u></b>{text[end:]}"
+
+    def user_gloss_info(self, lemma):
+        glosses = self.loaded_data(self.user_glosses)
+        suggestions = glosses.suggestions(lemma) if glosses is not None else []
+        if not suggestions:
+            return ""
+        shown = ", ".join(f"{word} ({count})" for word, count in suggestions)
+        return f"<div style='font-size:15px'><b>Your usual translations:</b> {shown}</div>"
+
+    def alignment_info(self, lemma):
+        alignment = self.loaded_data(self.alignment)
+        if alignment is None:
+            return ""
+        info = "<div style='font-size:15px'><b>Likely English glosses:</b>"
+        for translation in ALIGNMENT_TRANSLATIONS:
+            text = lookup_english_verse(self.current_book, self.current_chapter, self.current_verse, translation)
+            span = self.gloss_span(translation, text)
+            here = f"<u>{text[span[0]:span[1]]}</u> in this verse" if span else "no confident match in this verse"
+            usual = ", ".join(word for word, _ in alignment.lemma_glosses(translation, lemma))
+            info += f"<br><b>{translation}:</b> {here}" + (f"; usually {usual}" if usual else "")
+        return info + "</div>"
+
+    def show_concordance(self, lemma):
+        self.concordance_list.clear()
+        self._concordance_lemma = lemma
+        self._concordance_page = 0
+        if not self.concordance.is_loaded():
+            self.concordance_list.addItem("Concordance is still loading...")
+            self.concordance_more_button.setEnabled(False)
+            # Fill the list in once loading finishes
+            self._concordance_timer.start(200)
+            return
+        concordance = self.loaded_data(self.concordance)
+        if concordance is None:
+            self.concordance_list.addItem("The concordance could not be loaded.")
+            self.concordance_more_button.setEnabled(False)
+            return
+        count = concordance.count(lemma)
+        self.concordance_label.setText(f"Occurrences of {lemma}: {count}")
+        self.add_concordance_page()
+
+    def refresh_concordance(self):
+        if not self.concordance.is_loaded():
+            return
+        self._concordance_timer.stop()
+        if self._concordance_lemma is not None:
+            self.show_concordance(self._concordance_lemma)
+
+    def show_more_concordance(self):
+        if self._concordance_lemma is not None and self.concordance.is_loaded():
+            self._concordance_page += 1
+            self.add_concordance_page()
+
+    def add_concordance_page(self, page_size=50):
+        concordance = self.loaded_data(self.concordance)
+        if concordance is None:
+            return
+        for occurrence in concordance.page(self._concordance_lemma, self._concordance_page, page_size):
+            book, chapter, verse = occurrence['reference']
+            item = QListWidgetItem(f"{book} {chapter}:{verse}  {occurrence['word']}")
+            item.setToolTip(occurrence['context'])
+            item.setData(Qt.UserRole, occurrence['reference'])
+            self.concordance_list.addItem(item)
+        shown = (self._concordance_page + 1) * page_size
+        self.concordance_more_button.setEnabled(shown < concordance.count(self._concordance_lemma))
+
+    def open_concordance_item(self, item):
+        self.open_reference(item.data(Qt.UserRole))
+
+    def open_reference(self, reference):
+        if not reference or not self.maybe_save_translation():
+            return
+        self.current_book, self.current_chapter, self.current_verse = reference
+        self.update_verse()
 
     def open_wiktionary(self):
         idx = self.word_list.currentRow()
@@ -657,4 +1031,5 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = TranslationHelperGUI()
     window.show()
+    window.start_background_loading()
     sys.exit(app.exec_())
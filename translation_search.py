@@ -0,0 +1,125 @@
+"""
+Full-text search over the user's own translations.
+
+Queries are whitespace-separated clauses that must all match the same verse:
+a word, a prefix ending in "*" (e.g. propitiat*), or a "quoted phrase".
+Matching ignores case.
+"""
+
+import bisect
+import re
+import threading
+
+from data_structures import NUMBER_TO_DATA, UserTranslationIndex, get_book_number
+
+TOKEN_PATTERN = re.compile(r"\w+(?:'\w+)*")
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+class TranslationIndex:
+    """
+    Positional inverted index over user translations, keyed by (book_num, chapter, verse).
+    postings maps each term to {verse key: [token positions]}, and terms keeps the
+    vocabulary sorted for prefix queries. Saving a verse only touches that verse's terms,
+    and queries cost dictionary and bisect lookups, independent of how much is indexed.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.terms = []
+        self.docs = {}
+        self._lock = threading.RLock()
+
+    def build(self, verses):
+        """Index (book, chapter, verse, text) tuples, e.g. from a store's iter_all()."""
+        with self._lock:
+            for book, chapter, verse, text in verses:
+                self.update(book, chapter, verse, text)
+
+    def update(self, book, chapter, verse, text):
+        """Replace the indexed text of one verse; an empty text removes it."""
+        key = (get_book_number(book), int(chapter), int(verse))
+        if key[0] is None:
+            return
+        with self._lock:
+            for term in set(self.docs.pop(key, ())):
+                docs = self.postings[term]
+                del docs[key]
+                if not docs:
+                    del self.postings[term]
+                    del self.terms[bisect.bisect_left(self.terms, term)]
+            tokens = tokenize(text or "")
+            if not tokens:
+                return
+            self.docs[key] = tokens
+            for position, term in enumerate(tokens):
+                docs = self.postings.get(term)
+                if docs is None:
+                    docs = self.postings[term] = {}
+                    bisect.insort(self.terms, term)
+                docs.setdefault(key, []).append(position)
+
+    def _prefix_docs(self, prefix):
+        docs = set()
+        start = bisect.bisect_left(self.terms, prefix)
+        for term in self.terms[start:]:
+            if not term.startswith(prefix):
+                break
+            docs.update(self.postings[term])
+        return docs
+
+    def _phrase_docs(self, tokens):
+        postings = [self.postings.get(term) for term in tokens]
+        if not all(postings):
+            return set()
+        candidates = set.intersection(*(set(docs) for docs in postings))
+        matches = set()
+        for key in candidates:
+            following = [set(docs[key]) for docs in postings[1:]]
+            if any(all(start + i + 1 in positions for i, positions in enumerate(following))
+                   for start in postings[0][key]):
+                matches.add(key)
+        return matches
+
+    def search(self, query):
+        """Return the (book, chapter, verse) references matching every clause, in canonical order."""
+        clauses = []
+        for phrase, word in QUERY_PATTERN.findall(query):
+            if phrase:
+                if tokenize(phrase):
+                    clauses.append(('phrase', tokenize(phrase)))
+            elif word.endswith("*") and tokenize(word):
+                clauses.append(('prefix', tokenize(word)[0]))
+            else:
+                clauses.extend(('phrase', [token]) for token in tokenize(word))
+        if not clauses:
+            raise ValueError("Enter a word, prefix* or \"phrase\" to search for")
+        with self._lock:
+            result = None
+            for kind, value in clauses:
+                docs = self._prefix_docs(value) if kind == 'prefix' else self._phrase_docs(value)
+                result = docs if result is None else result & docs
+                if not result:
+                    return []
+        return [(NUMBER_TO_DATA[book_num][0], chapter, verse) for book_num, chapter, verse in sorted(result)]
+
+
+def _build_translation_index(verses):
+    index = TranslationIndex()
+    index.build(verses)
+    return index
+
+
+_translation_index = UserTranslationIndex(_build_translation_index, TranslationIndex.update)
+
+
+def load_translation_index():
+    """
+    Return the shared index, building it from the active store on first use.
+    Saves made during the build are queued and applied before it is returned, so they never wait for it.
+    """
+    return _translation_index.load()
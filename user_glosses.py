@@ -0,0 +1,94 @@
+"""
+Gloss suggestions mined from the user's own translations: for each lemma, the English
+words the user has most often used in verses containing it.
+"""
+
+import threading
+from collections import Counter
+
+from data_structures import UserTranslationIndex, get_greek_text
+from translation_search import tokenize
+
+
+class UserGlossStats:
+    """
+    Verse-level co-occurrence counts between lemmas and the words of the user's translations.
+    pairs[lemma] counts, per English word, the translated verses containing both;
+    lemma_verses and word_verses count the translated verses containing each on its own.
+    Saving a verse subtracts its old contribution and adds the new one, so an update costs
+    O(lemmas x words) of that verse and never rescans the other translations.
+    The text counted for each verse is kept, so applying the same save twice is harmless.
+    """
+
+    def __init__(self):
+        self.pairs = {}
+        self.lemma_verses = Counter()
+        self.word_verses = Counter()
+        self.counted = {}
+        self._lock = threading.RLock()
+
+    def _apply(self, lemmas, words, sign):
+        if not lemmas or not words:
+            return
+        for counter, keys in ((self.lemma_verses, lemmas), (self.word_verses, words)):
+            for key in keys:
+                counter[key] += sign
+                if counter[key] <= 0:
+                    del counter[key]
+        for lemma in lemmas:
+            counts = self.pairs.setdefault(lemma, Counter())
+            for word in words:
+                counts[word] += sign
+                if counts[word] <= 0:
+                    del counts[word]
+            if not counts:
+                del self.pairs[lemma]
+
+    def update(self, book, chapter, verse, text):
+        """Replace the counted translation of one verse."""
+        key = (book, int(chapter), int(verse))
+        lemmas = {word['lemma'] for word in get_greek_text(book, int(chapter), int(verse))}
+        with self._lock:
+            self._apply(lemmas, set(tokenize(self.counted.pop(key, ""))), -1)
+            if text:
+                self.counted[key] = text
+                self._apply(lemmas, set(tokenize(text)), 1)
+
+    def build(self, verses):
+        """Count (book, chapter, verse, text) tuples, e.g. from a store's iter_all()."""
+        with self._lock:
+            for book, chapter, verse, text in verses:
+                self.update(book, chapter, verse, text)
+
+    def suggestions(self, lemma, limit=5, min_verses=2):
+        """
+        The user's likeliest glosses for a lemma as (word, verse count) pairs, best first.
+        Words are ranked by Dice score so that words used in every verse ("the", "and")
+        do not crowd out the real glosses.
+        """
+        with self._lock:
+            counts = self.pairs.get(lemma)
+            if not counts:
+                return []
+            lemma_count = self.lemma_verses[lemma]
+            scored = [(2 * count / (lemma_count + self.word_verses[word]), word, count)
+                      for word, count in counts.items() if count >= min(min_verses, lemma_count)]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(word, count) for _, word, count in scored[:limit]]
+
+
+def _build_user_glosses(verses):
+    stats = UserGlossStats()
+    stats.build(verses)
+    return stats
+
+
+_user_glosses = UserTranslationIndex(_build_user_glosses, UserGlossStats.update)
+
+
+def load_user_glosses():
+    """
+    Return the shared statistics, counting the active store on first use.
+    As with the translation index, saves made during the count are queued rather than waiting for it.
+    """
+    return _user_glosses.load()